@@ -1,24 +1,42 @@
+import argparse
 import asyncio
 import json
 from newsletter.agent import NewsletterAgent
+from newsletter.daemon import NewsletterDaemon
 
-async def main():
+async def main(personalized: bool = False):
     """Run the newsletter agent"""
     print("🚀 Starting Newsletter Agent...")
     
     try:
         async with NewsletterAgent() as agent:
-            newsletter_content = await agent.run()
+            if personalized:
+                digests = await agent.run_personalized()
+                print(f"✅ Built newsletters for {len(digests)} subscribers!")
+                return
+            
+            filename, preview = await agent.run()
             print("✅ Newsletter generated successfully!")
             print("\n📰 Preview:")
             print("-" * 50)
-            print(newsletter_content[:300] + "...")
+            print(preview + "...")
             print("-" * 50)
-            print("\n📁 Check your folder for the complete newsletter file!")
+            if filename:
+                print(f"\n📁 The complete newsletter is in {filename}")
             
     except Exception as e:
         print(f"❌ Error: {e}")
         print("💡 Make sure you have created config.json and have internet connection")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate your newsletter")
+    parser.add_argument("--personalized", action="store_true",
+                        help="build a newsletter for every subscriber in config.json from one fetch")
+    parser.add_argument("--daemon", action="store_true",
+                        help="keep running and generate newsletters on the schedule in config.json")
+    args = parser.parse_args()
+    
+    if args.daemon:
+        asyncio.run(NewsletterDaemon(personalized=args.personalized or None).serve())
+    else:
+        asyncio.run(main(personalized=args.personalized))
\ No newline at end of file
@@ -2,23 +2,66 @@ import asyncio
 import aiohttp
 import json
 import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from email.message import EmailMessage
 from datetime import datetime
-from typing import List, Dict
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
 
+from .generators import NewsletterGenerator, build_document, get_generator, render_all
 from .models import NewsItem
+from .personalization import PersonalizationEngine, Subscriber
+from .sources.gmail import GmailSource
+from .sources.google_news import GoogleNewsSource
 from .sources.hackernews import HackerNewsSource
+from .sources.nytimes import NYTimesSource
+from .sources.reddit import RedditSource
 from .sources.rss import RSSSource
+from .utils.archive import NewsletterArchive
+from .utils.dedup import Deduplicator, NearDuplicateClusterer
+from .utils.disk_cache import DiskCache
+from .utils.email_sender import AsyncEmailSender, SendStats, build_message
+from .utils.filters import KeywordMatcher, TopKRanker
+from .utils.http_cache import HTTPCache
+from .utils.scoring import ScoreNormalizer, ScoringWeights
+from .utils.seen_store import SeenItemStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
+# Seconds a single source may take before it is abandoned
+DEFAULT_SOURCE_TIMEOUT = 30
+
+# Characters of the primary format that run() returns as a preview
+PREVIEW_CHARS = 300
+
 class NewsletterAgent:
     """Main agent class for aggregating and generating newsletters"""
     
     def __init__(self, config_path: str = "config.json"):
         self.config = self._load_config(config_path)
         self.session = None
+        self.parse_executor = None
+        self.email_sender = None
+        # Outlives individual runs so validators are reused between them
+        self.http_cache = HTTPCache(
+            self._build_disk_cache(),
+            max_entries=self.config.get("cache", {}).get("memory_entries", 2048)
+        )
+        self.seen_store = self._build_seen_store()
+        # Opened per context, since leaving the context closes it
+        self.archive = None
+        self.score_normalizer = self._build_score_normalizer()
+        self.scoring_weights = ScoringWeights.from_config(self.config.get("ranking", {}))
+        # Kept for the agent's lifetime so compiled templates and rendered
+        # fragments are shared by every newsletter it renders
+        self._generators: Dict[str, NewsletterGenerator] = {}
+        # Built on the first run inside the context, then reused, so source
+        # credentials and tokens survive between runs
+        self._sources: Optional[List[Tuple[str, object, float]]] = None
         
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from JSON file"""
@@ -29,6 +72,38 @@ class NewsletterAgent:
             logger.warning(f"Config file {config_path} not found. Using default config.")
             return self._get_default_config()
     
+    def _build_disk_cache(self):
+        """Create the persistent response cache if it is enabled in config"""
+        cache_config = self.config.get("cache", {})
+        if not cache_config.get("enabled"):
+            return None
+        
+        return DiskCache(
+            cache_config.get("directory", ".newsletter_cache"),
+            max_bytes=int(cache_config.get("max_size_mb", 100) * 1024 * 1024),
+            default_ttl=cache_config.get("default_ttl", 900),
+            ttls=cache_config.get("ttl", {})
+        )
+    
+    def _build_seen_store(self):
+        """Open the delivered-item store if tracking is enabled in config"""
+        db_config = self.config.get("database", {})
+        if not db_config.get("track_seen_items"):
+            return None
+        
+        return SeenItemStore(
+            db_config.get("connection_string", "sqlite:///newsletter.db"),
+            retention_days=db_config.get("retention_days", 30)
+        )
+    
+    def _build_archive(self):
+        """Open the searchable edition archive if it is enabled in config"""
+        archive_config = self.config.get("archive", {})
+        if not archive_config.get("enabled"):
+            return None
+        
+        return NewsletterArchive(archive_config.get("path", "newsletter_archive.db"))
+    
     def _get_default_config(self) -> Dict:
         """Default configuration"""
         return {
@@ -50,45 +125,281 @@ class NewsletterAgent:
             },
             "output": {
                 "format": "markdown",
+                "formats": ["markdown"],
                 "save_to_file": True,
                 "filename_template": "newsletter_{date}.md"
             }
         }
     
+    def _build_score_normalizer(self) -> ScoreNormalizer:
+        """Per-source score statistics and time decay from the ranking config"""
+        ranking = self.config.get("ranking", {})
+        return ScoreNormalizer(
+            half_life_hours=ranking.get("half_life_hours", 24),
+            alpha=ranking.get("stats_alpha", 0.3),
+            state_path=ranking.get("stats_path")
+        )
+    
+    def _build_email_sender(self):
+        """Create the SMTP sender if a server is configured"""
+        smtp_config = self.config.get("smtp", {})
+        if not smtp_config.get("host"):
+            return None
+        
+        output = self.config["output"]
+        return AsyncEmailSender(
+            smtp_config["host"],
+            port=smtp_config.get("port", 587),
+            username=smtp_config.get("username") or output.get("email_from") or None,
+            password=smtp_config.get("password") or output.get("email_password") or None,
+            starttls=smtp_config.get("starttls", True),
+            use_tls=smtp_config.get("use_tls", False),
+            pool_size=smtp_config.get("pool_size", 5),
+            rate_limit=smtp_config.get("rate_limit"),
+            max_messages_per_connection=smtp_config.get("max_messages_per_connection", 100),
+            timeout=smtp_config.get("timeout", 30),
+            idle_timeout=smtp_config.get("idle_timeout", 60)
+        )
+    
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create the pooled HTTP session shared by every source"""
+        http_config = self.config.get("http", {})
+        
+        connector = aiohttp.TCPConnector(
+            limit=http_config.get("max_connections", 100),
+            limit_per_host=http_config.get("max_connections_per_host", 10),
+            ttl_dns_cache=http_config.get("dns_cache_ttl", 300),
+            keepalive_timeout=http_config.get("keepalive_timeout", 30)
+        )
+        timeout = aiohttp.ClientTimeout(
+            connect=http_config.get("connect_timeout", 10),
+            sock_read=http_config.get("read_timeout", 20)
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+    
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        self.session = self._create_session()
+        
+        # Feed parsing is CPU-bound; with parse_workers set it moves to a
+        # process pool, otherwise it runs in the loop's default thread pool
+        parse_workers = self.config["sources"].get("rss_feeds", {}).get("parse_workers", 0)
+        if parse_workers:
+            self.parse_executor = ProcessPoolExecutor(max_workers=parse_workers)
+        
+        self.email_sender = self._build_email_sender()
+        self.archive = self._build_archive()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
+        # Sources hold the session being closed
+        self._sources = None
         if self.session:
             await self.session.close()
+        if self.parse_executor:
+            self.parse_executor.shutdown()
+        if self.email_sender:
+            await self.email_sender.close()
+        if self.seen_store:
+            self.seen_store.close()
+        if self.archive:
+            self.archive.close()
+            self.archive = None
+    
+    def _build_sources(self) -> List[Tuple[str, object, float]]:
+        """Instantiate every enabled source with its timeout"""
+        sources_config = self.config["sources"]
+        max_items = self.config["preferences"]["max_items"]
+        sources = []
+        
+        def timeout_for(source_config: Dict) -> float:
+            return source_config.get("timeout", DEFAULT_SOURCE_TIMEOUT)
+        
+        hn_config = sources_config.get("hackernews", {})
+        if hn_config.get("enabled"):
+            hn_source = HackerNewsSource(
+                self.session,
+                hn_config.get("max_items", max_items),
+                story_limit=hn_config.get("story_limit", 20),
+                max_concurrency=hn_config.get("max_concurrency", 10),
+                cache=self.http_cache
+            )
+            sources.append(("Hacker News", hn_source, timeout_for(hn_config)))
+        
+        rss_config = sources_config.get("rss_feeds", {})
+        if rss_config.get("enabled") and rss_config.get("urls"):
+            rss_source = RSSSource(
+                self.session,
+                rss_config["urls"],
+                max_concurrency=rss_config.get("max_concurrency", 10),
+                executor=self.parse_executor,
+                cache=self.http_cache
+            )
+            sources.append(("RSS", rss_source, timeout_for(rss_config)))
+        
+        google_config = sources_config.get("google_news", {})
+        if google_config.get("enabled"):
+            sources.append((
+                "Google News",
+                GoogleNewsSource(self.session, google_config.get("api_key", ""), max_items, cache=self.http_cache),
+                timeout_for(google_config)
+            ))
+        
+        reddit_config = sources_config.get("reddit", {})
+        if reddit_config.get("enabled") and reddit_config.get("subreddits"):
+            reddit_source = RedditSource(
+                self.session,
+                reddit_config["subreddits"],
+                posts_per_subreddit=reddit_config.get("posts_per_subreddit", 5),
+                max_concurrency=reddit_config.get("max_concurrency", 10)
+            )
+            sources.append(("Reddit", reddit_source, timeout_for(reddit_config)))
+        
+        nyt_config = sources_config.get("nytimes", {})
+        if nyt_config.get("enabled"):
+            sources.append((
+                "New York Times",
+                NYTimesSource(self.session, nyt_config.get("api_key", ""), max_items, cache=self.http_cache),
+                timeout_for(nyt_config)
+            ))
+        
+        gmail_config = sources_config.get("gmail", {})
+        if gmail_config.get("enabled"):
+            gmail_source = GmailSource(
+                gmail_config.get("query", "from:newsletters OR subject:important"),
+                max_items=gmail_config.get("max_items", 5),
+                sync_state_path=gmail_config.get("sync_state_path", "gmail_sync.json")
+            )
+            sources.append(("Gmail", gmail_source, timeout_for(gmail_config)))
+        
+        return sources
+    
+    async def _fetch_source(self, name: str, source, timeout: float) -> List[NewsItem]:
+        """Fetch a single source, isolating its timeout and failures from the others"""
+        try:
+            return await asyncio.wait_for(source.fetch(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"{name} timed out after {timeout}s. Skipping.")
+        except Exception as e:
+            logger.error(f"Error fetching {name}: {e}")
+        return []
+    
+    async def _fetch_batches(self) -> AsyncIterator[List[NewsItem]]:
+        """Yield each enabled source's items as soon as that source finishes"""
+        if self._sources is None:
+            self._sources = self._build_sources()
+        
+        # Each source runs under its own timeout, so a slow or failing source
+        # only costs its own results and the run finishes with the slowest one.
+        fetches = [self._fetch_source(name, source, timeout) for name, source, timeout in self._sources]
+        for next_batch in asyncio.as_completed(fetches):
+            items = await next_batch
+            self.score_normalizer.update(items)
+            yield items
+    
+    def _log_cache_stats(self):
+        if self.http_cache.store:
+            stats = self.http_cache.store.stats()
+            logger.info(
+                f"Response cache: {sum(stats['hits'].values())} hits, "
+                f"{sum(stats['misses'].values())} misses, {stats['evictions']} evictions"
+            )
     
     async def aggregate_content(self) -> List[NewsItem]:
-        """Aggregate content from all enabled sources"""
-        all_items = []
+        """Aggregate content from all enabled sources concurrently"""
+        ranker = self._create_ranker()
+        deduplicator = Deduplicator()
+        clusterer = self._create_clusterer()
         
-        # Fetch from Hacker News
-        if self.config["sources"]["hackernews"]["enabled"]:
-            hn_source = HackerNewsSource(self.session, self.config["preferences"]["max_items"])
-            hn_items = await hn_source.fetch()
-            all_items.extend(hn_items)
+        # Batches are ranked as they land; only the current top-K is retained
+        fetched = 0
+        async for items in self._fetch_batches():
+            fetched += len(items)
+            self._rank_items(ranker, items, deduplicator, clusterer)
         
-        # Fetch from RSS feeds
-        rss_config = self.config["sources"]["rss_feeds"]
-        if rss_config["enabled"] and rss_config.get("urls"):
-            rss_source = RSSSource(rss_config["urls"])
-            rss_items = await rss_source.fetch()
-            all_items.extend(rss_items)
+        logger.info(
+            f"Ranked {clusterer.clusters} stories ({len(deduplicator)} unique items) "
+            f"out of {fetched} fetched items"
+        )
+        self._log_cache_stats()
         
-        # Filter and rank items
-        return self._filter_and_rank_items(all_items)
+        return ranker.results()
     
-    def _filter_and_rank_items(self, items: List[NewsItem]) -> List[NewsItem]:
-        """Filter and rank news items based on preferences"""
+    async def collect_corpus(self) -> List[NewsItem]:
+        """Fetch every source once and return all stories, unfiltered.
+        
+        Duplicates and near-duplicates are merged as in aggregate_content,
+        but no preferences are applied, so the corpus can be shared by many
+        subscribers.
+        """
+        deduplicator = Deduplicator()
+        clusterer = self._create_clusterer()
+        stories: Dict[int, NewsItem] = {}
+        
+        fetched = 0
+        async for items in self._fetch_batches():
+            fetched += len(items)
+            self._score_items(items)
+            for item in items:
+                item, _ = deduplicator.add(item)
+                representative = clusterer.add(item)
+                stories[id(representative)] = representative
+        
+        logger.info(f"Collected {len(stories)} stories out of {fetched} fetched items")
+        self._log_cache_stats()
+        
+        return list(stories.values())
+    
+    def _create_ranker(self) -> TopKRanker:
+        """Bounded ranker ordering by rank score (descending) and then by published date"""
+        return TopKRanker(self.config["preferences"]["max_items"], key=self._rank_key)
+    
+    def _score_items(self, items: List[NewsItem], keywords: Sequence[str] = ()):
+        """Set each item's rank score in one vectorized pass.
+        
+        Items are normalized against their own source's statistics and
+        weighted by the ranking config before any merging, and merges keep
+        the best rank score, so a story's rank does not depend on which
+        source's copy arrived first. Hits on ``keywords`` count towards the
+        keyword weight.
+        """
+        scores = self.scoring_weights.item_scores(items, self.score_normalizer.rank_scores(items)).tolist()
+        keyword_weight = self.scoring_weights.keyword
+        keywords = [keyword.lower() for keyword in keywords if keyword] if keyword_weight else []
+        for item, score in zip(items, scores):
+            if keywords:
+                text = f"{item.title} {item.summary}".lower()
+                score += keyword_weight * sum(keyword in text for keyword in keywords)
+            item.rank_score = score
+    
+    def _rank_key(self, item: NewsItem) -> Tuple[float, float]:
+        if item.rank_score is None:
+            self._score_items([item])
+        return (item.rank_score, item.published_ts if item.published_ts is not None else -math.inf)
+    
+    def _create_clusterer(self) -> NearDuplicateClusterer:
+        """Near-duplicate story detector configured from preferences"""
+        return NearDuplicateClusterer(self.config["preferences"].get("similarity_threshold", 0.75))
+    
+    def _rank_items(self, ranker: TopKRanker, items: List[NewsItem], deduplicator: Deduplicator,
+                    clusterer: NearDuplicateClusterer):
+        """Feed items that pass the preference filters into the ranker.
+        
+        Exact duplicates are merged into the earlier item and near-duplicates
+        into their story's representative, which is then re-pushed so the
+        ranker sees the cluster's best score. Each item is normalized within
+        its own source and time-decayed before it is merged, and the
+        representative keeps the best of its members' rank scores.
+        """
         prefs = self.config["preferences"]
-        filtered_items = []
+        
+        # Stories already sent in an earlier newsletter never reach ranking
+        if self.seen_store:
+            items = self.seen_store.filter_unseen(items)
+        
+        matcher = KeywordMatcher.compile(tuple(prefs["include_keywords"]), tuple(prefs["exclude_keywords"]))
+        kept = []
         
         for item in items:
             # Score filtering
@@ -96,64 +407,229 @@ class NewsletterAgent:
                 continue
             
             # Keyword filtering
-            if not item.matches_keywords(prefs["include_keywords"], prefs["exclude_keywords"]):
+            if not matcher.matches(f"{item.title} {item.summary}"):
                 continue
             
-            filtered_items.append(item)
+            kept.append(item)
         
-        # Sort by score (descending) and then by published date
-        filtered_items.sort(key=lambda x: (x.score, x.published_at or datetime.min), reverse=True)
+        self._score_items(kept, prefs["include_keywords"])
+        stories: Dict[int, NewsItem] = {}
+        for item in kept:
+            item, _ = deduplicator.add(item)
+            representative = clusterer.add(item)
+            stories[id(representative)] = representative
         
-        # Return top N items
-        return filtered_items[:prefs["max_items"]]
+        for story in stories.values():
+            # Only sources weighted 0 score -inf
+            if story.rank_score > -math.inf:
+                ranker.push(story, self._rank_key(story))
+    
+    def _filter_and_rank_items(self, items: List[NewsItem]) -> List[NewsItem]:
+        """Filter and rank news items based on preferences"""
+        ranker = self._create_ranker()
+        self.score_normalizer.update(items)
+        self._rank_items(ranker, items, Deduplicator(), self._create_clusterer())
+        
+        # Top N items
+        return ranker.results()
+    
+    def _output_generators(self) -> List[NewsletterGenerator]:
+        """Generators for the configured formats, the primary ``format`` first"""
+        output = self.config["output"]
+        primary = output.get("format", "markdown")
+        names = [primary] + [name for name in output.get("formats", []) if name != primary]
+        return [self._generator(name) for name in dict.fromkeys(names)]
+    
+    def _generator(self, name: str) -> NewsletterGenerator:
+        if name not in self._generators:
+            self._generators[name] = get_generator(name, **self._generator_options(name))
+        return self._generators[name]
+    
+    def _generator_options(self, name: str) -> Dict:
+        if name != "html":
+            return {}
+        
+        options = {"fragment_cache_size": self.config["output"].get("fragment_cache_size", 10000)}
+        cache_config = self.config.get("cache", {})
+        if cache_config.get("enabled"):
+            options["bytecode_cache_dir"] = os.path.join(
+                cache_config.get("directory", ".newsletter_cache"), "templates"
+            )
+        return options
+    
+    def _output_filename(self, generator: NewsletterGenerator) -> str:
+        now = datetime.now()
+        filename = self.config["output"]["filename_template"].format(
+            date=now.strftime('%Y-%m-%d'), time=now.strftime('%H%M')
+        )
+        return os.path.splitext(filename)[0] + generator.extension
+    
+    def render_newsletter(self, items: List[NewsItem],
+                          generator: Optional[NewsletterGenerator] = None) -> Iterator[str]:
+        """Render the newsletter as a stream of chunks.
+        
+        Each chunk is produced on demand, so callers can write straight to a
+        file or HTTP response without holding the whole document. Defaults
+        to the configured output format.
+        """
+        generator = generator or self._output_generators()[0]
+        return generator.render(build_document(items))
     
     def generate_newsletter(self, items: List[NewsItem]) -> str:
-        """Generate markdown newsletter"""
-        content = f"""# Your Daily Newsletter - {datetime.now().strftime('%Y-%m-%d')}
-
-## Top Highlights ({len(items)} items)
-
-"""
-        
-        for i, item in enumerate(items, 1):
-            content += f"""### {i}. {item.title}
-**Source:** {item.source}
-"""
-            if item.summary:
-                content += f"**Summary:** {item.summary}\n"
-            
-            content += f"**Link:** [{item.title}]({item.url})\n"
-            
-            if item.score > 0:
-                content += f"**Score:** {item.score}\n"
+        """Generate the newsletter in the configured output format"""
+        return "".join(self.render_newsletter(items))
+    
+    def stream_newsletter(self, items: List[NewsItem], out: TextIO):
+        """Write the newsletter chunk by chunk to any text stream"""
+        out.writelines(self.render_newsletter(items))
+    
+    async def save_newsletter(self, content: Union[str, Iterable[str]]) -> Optional[str]:
+        """Save newsletter to file, returning the filename.
+        
+        Accepts the rendered text or an iterable of chunks, which are
+        written as they are produced.
+        """
+        if not self.config["output"]["save_to_file"]:
+            return None
+        
+        filename = self._output_filename(self._output_generators()[0])
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            if isinstance(content, str):
+                f.write(content)
+            else:
+                f.writelines(content)
+        
+        logger.info(f"Newsletter saved to {filename}")
+        return filename
+    
+    def preview_newsletter(self, items: List[NewsItem], length: int = PREVIEW_CHARS) -> str:
+        """The start of the newsletter, rendering only as much as needed"""
+        preview = ""
+        for chunk in self.render_newsletter(items):
+            preview += chunk
+            if len(preview) >= length:
+                break
+        return preview[:length]
+    
+    def save_formats(self, items: List[NewsItem]) -> Tuple[str, List[str]]:
+        """Render and save every configured format in one pass over the items.
+        
+        Chunks go straight to the files. Returns the first ``PREVIEW_CHARS``
+        characters of the primary format and the filenames written, the
+        primary format's file first.
+        """
+        generators = self._output_generators()
+        filenames = [self._output_filename(generator) for generator in generators]
+        preview: List[str] = []
+        preview_length = 0
+        
+        with ExitStack() as stack:
+            files = [stack.enter_context(open(filename, 'w', encoding='utf-8')) for filename in filenames]
             
-            if item.published_at:
-                content += f"**Published:** {item.published_at.strftime('%Y-%m-%d %H:%M')}\n"
+            def tee(chunk: str, write=files[0].write):
+                nonlocal preview_length
+                if preview_length < PREVIEW_CHARS:
+                    preview.append(chunk)
+                    preview_length += len(chunk)
+                write(chunk)
             
-            content += "\n---\n\n"
+            outputs = [(generators[0], tee)] + [(generator, f.write) for generator, f in zip(generators[1:], files[1:])]
+            render_all(build_document(items), outputs)
+        
+        for filename in filenames:
+            logger.info(f"Newsletter saved to {filename}")
+        return "".join(preview)[:PREVIEW_CHARS], filenames
+    
+    async def email_newsletter(self, items: List[NewsItem]) -> Optional[SendStats]:
+        """Email the newsletter to each address in output.email_to.
         
-        content += f"""
-*Generated by your AI Newsletter Agent at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
-"""
+        The HTML and text formats are rendered for the message body only
+        when there is someone to send it to.
+        """
+        output = self.config["output"]
+        recipients = [address.strip() for address in output.get("email_to", "").split(",") if address.strip()]
+        if not self.email_sender or not recipients:
+            return None
         
-        return content
+        html = "".join(self.render_newsletter(items, self._generator("html")))
+        text = "".join(self.render_newsletter(items, self._generator("text")))
+        subject = f"Your Daily Newsletter - {datetime.now().strftime('%Y-%m-%d')}"
+        
+        stats = await self.email_sender.send_many(
+            build_message(output["email_from"], recipient, subject, text, html) for recipient in recipients
+        )
+        for recipient, error in stats.failures:
+            logger.error(f"Could not deliver newsletter to {recipient}: {error}")
+        return stats
     
-    async def save_newsletter(self, content: str):
-        """Save newsletter to file"""
-        if not self.config["output"]["save_to_file"]:
-            return
+    def _load_subscribers(self) -> List[Subscriber]:
+        """Subscribers from config, with unset preferences taken from ``preferences``.
         
-        filename = self.config["output"]["filename_template"].format(
-            date=datetime.now().strftime('%Y-%m-%d')
+        Digests are keyed by subscriber ID, so IDs must be unique; a repeated
+        one would send one reader's digest to another.
+        """
+        defaults = self.config["preferences"]
+        subscribers = [Subscriber.from_config(subscriber, defaults) for subscriber in self.config.get("subscribers", [])]
+        seen = set()
+        for subscriber in subscribers:
+            if subscriber.id in seen:
+                raise ValueError(f"Duplicate subscriber id: {subscriber.id!r}")
+            seen.add(subscriber.id)
+        return subscribers
+    
+    def _digest_messages(self, subscribers: List[Subscriber], digests: Dict[str, List[NewsItem]]) -> Iterator[EmailMessage]:
+        """Render each subscriber's digest into an email as it is sent"""
+        sender = self.config["output"]["email_from"]
+        subject = f"Your Daily Newsletter - {datetime.now().strftime('%Y-%m-%d')}"
+        text_generator = self._generator("text")
+        html_generator = self._generator("html")
+        
+        for subscriber in subscribers:
+            items = digests[subscriber.id]
+            if not subscriber.email or not items:
+                continue
+            text = "".join(self.render_newsletter(items, text_generator))
+            html = "".join(self.render_newsletter(items, html_generator))
+            yield build_message(sender, subscriber.email, subject, text, html)
+    
+    async def run_personalized(self) -> Dict[str, List[NewsItem]]:
+        """Build a newsletter for every configured subscriber from one fetch.
+        
+        Sources are fetched once, and each subscriber's preferences are then
+        evaluated against the shared corpus through the personalization
+        engine's inverted index. Digests are emailed when an SMTP server is
+        configured. The edition archive and seen-item store track a single
+        audience, so they are not updated here.
+        """
+        subscribers = self._load_subscribers()
+        if not subscribers:
+            logger.warning("No subscribers configured.")
+            return {}
+        
+        corpus = await self.collect_corpus()
+        engine = PersonalizationEngine(corpus, key=self._rank_key)
+        digests = engine.rank_all(
+            subscribers, self.scoring_weights,
+            item_scores=[item.rank_score for item in engine.items]
         )
+        self.score_normalizer.save()
+        logger.info(f"Selected newsletters for {len(digests)} subscribers from {len(engine)} stories")
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(content)
+        if self.email_sender:
+            stats = await self.email_sender.send_many(self._digest_messages(subscribers, digests))
+            for recipient, error in stats.failures:
+                logger.error(f"Could not deliver newsletter to {recipient}: {error}")
         
-        logger.info(f"Newsletter saved to {filename}")
+        return digests
     
-    async def run(self) -> str:
-        """Main method to run the newsletter agent"""
+    async def run(self) -> Tuple[Optional[str], str]:
+        """Main method to run the newsletter agent.
+        
+        Returns the primary format's filename (None when files are not
+        saved) and a short preview of the newsletter. The full document is
+        only ever streamed to its files.
+        """
         logger.info("Starting newsletter generation...")
         
         # Aggregate content from all sources
@@ -161,15 +637,32 @@ class NewsletterAgent:
         
         if not items:
             logger.warning("No items found. Newsletter not generated.")
-            return "No items found."
+            return None, "No items found."
         
         logger.info(f"Found {len(items)} items for newsletter")
         
-        # Generate newsletter
-        content = self.generate_newsletter(items)
+        # Generate the newsletter and save each configured format
+        if self.config["output"]["save_to_file"]:
+            preview, filenames = self.save_formats(items)
+            filename = filenames[0]
+        else:
+            preview = self.preview_newsletter(items)
+            filename = None
+        
+        if self.archive:
+            self.archive.record_edition(items, filename)
+        
+        self.score_normalizer.save()
+        stats = await self.email_newsletter(items)
         
-        # Save to file
-        await self.save_newsletter(content)
+        # Items only count as seen once the server accepted a message for
+        # at least one recipient, so a failed send repeats them next time
+        if self.seen_store:
+            if stats is None or stats.sent:
+                self.seen_store.mark_delivered(items)
+            else:
+                logger.warning("Newsletter was not accepted for delivery; its items stay unseen")
+            self.seen_store.prune()
         
         logger.info("Newsletter generation complete!")
-        return content
\ No newline at end of file
+        return filename, preview
\ No newline at end of file
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import signal
+import time
+from typing import Optional
+
+from .agent import NewsletterAgent
+
+logger = logging.getLogger(__name__)
+
+class NewsletterDaemon:
+    """Runs the newsletter agent on a fixed schedule in one long-lived process.
+    
+    One NewsletterAgent is entered once and reused for every run, so its
+    HTTP connection pool and DNS cache, response caches, compiled templates
+    and fragments, SMTP connections, seen-item store and score statistics
+    stay warm between editions instead of being rebuilt each time.
+    
+    Runs start every ``interval`` seconds, counted from the first one. A run
+    that overruns its slot skips the missed starts rather than queueing
+    them. SIGTERM and SIGINT stop the daemon once the current run finishes;
+    SIGHUP starts a run immediately.
+    """
+    
+    def __init__(self, config_path: str = "config.json", interval: Optional[float] = None,
+                 personalized: Optional[bool] = None):
+        self.agent = NewsletterAgent(config_path)
+        daemon_config = self.agent.config.get("daemon", {})
+        self.interval = interval if interval is not None else daemon_config.get("interval_minutes", 60) * 60
+        self.personalized = personalized if personalized is not None else daemon_config.get("personalized", False)
+        if self.interval <= 0:
+            raise ValueError("Daemon interval must be positive")
+        output = self.agent.config.get("output", {})
+        if (output.get("save_to_file") and self.interval < 86400
+                and "{time}" not in output.get("filename_template", "")):
+            logger.warning(
+                "output.filename_template has no {time} placeholder, so each run "
+                "overwrites that day's earlier newsletter"
+            )
+        self.runs = 0
+        self.failures = 0
+        self._stop = asyncio.Event()
+        self._wake = asyncio.Event()
+    
+    def stop(self):
+        """Finish the current run, if any, and exit"""
+        logger.info("Shutdown requested")
+        self._stop.set()
+        self._wake.set()
+    
+    def trigger(self):
+        """Start a run now instead of waiting for the next slot"""
+        logger.info("Run requested")
+        self._wake.set()
+    
+    def _install_signal_handlers(self):
+        loop = asyncio.get_running_loop()
+        handlers = {signal.SIGTERM: self.stop, signal.SIGINT: self.stop}
+        if hasattr(signal, "SIGHUP"):
+            handlers[signal.SIGHUP] = self.trigger
+        for signum, handler in handlers.items():
+            try:
+                loop.add_signal_handler(signum, handler)
+            except (NotImplementedError, RuntimeError):
+                # Not available on Windows event loops or outside the main thread
+                logger.debug(f"Cannot handle signal {signum} here")
+    
+    async def _run_once(self):
+        start = time.perf_counter()
+        try:
+            if self.personalized:
+                await self.agent.run_personalized()
+            else:
+                await self.agent.run()
+        except Exception as e:
+            self.failures += 1
+            logger.exception(f"Newsletter run failed: {e}")
+        finally:
+            self.runs += 1
+            logger.info(f"Run {self.runs} finished in {time.perf_counter() - start:.1f}s")
+    
+    async def _sleep_until(self, deadline: float):
+        """Wait for the deadline, a stop request or a trigger, whichever comes first"""
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def serve(self):
+        """Run editions on schedule until stopped"""
+        self._install_signal_handlers()
+        logger.info(f"Newsletter daemon started, running every {self.interval / 60:g} minutes")
+        
+        async with self.agent:
+            next_run = time.monotonic()
+            while not self._stop.is_set():
+                await self._sleep_until(next_run)
+                if self._stop.is_set():
+                    break
+                
+                self._wake.clear()
+                await self._run_once()
+                
+                # Keep the cadence anchored to the first run, skipping missed slots
+                now = time.monotonic()
+                while next_run <= now:
+                    next_run += self.interval
+                logger.info(f"Next run in {(next_run - now) / 60:.1f} minutes")
+        
+        logger.info(f"Newsletter daemon stopped after {self.runs} runs ({self.failures} failed)")
@@ -0,0 +1,23 @@
+from .base import Document, Entry, NewsletterGenerator, build_document, render_all
+from .html import HTMLGenerator
+from .markdown import MarkdownGenerator
+from .text import TextGenerator
+
+GENERATORS = {
+    "markdown": MarkdownGenerator,
+    "html": HTMLGenerator,
+    "text": TextGenerator,
+}
+
+def get_generator(name: str, **options) -> NewsletterGenerator:
+    """Instantiate the generator registered for an output format"""
+    try:
+        generator_class = GENERATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown newsletter format: {name}")
+    return generator_class(**options)
+
+__all__ = [
+    "Document", "Entry", "NewsletterGenerator", "build_document", "render_all",
+    "HTMLGenerator", "MarkdownGenerator", "TextGenerator", "GENERATORS", "get_generator",
+]
@@ -0,0 +1,109 @@
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from html import escape
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+from ..models import NewsItem
+from ..utils.dedup import item_fingerprint
+from ..utils.sanitize import html_to_text, safe_url, sanitize_html
+
+@dataclass
+class Entry:
+    """One newsletter item, with display values formatted once for every format"""
+    index: int
+    title: str
+    url: str
+    source: str
+    # Plain text, and safe markup for HTML output (sanitized or escaped)
+    summary: str = ""
+    summary_html: str = ""
+    score: int = 0
+    published: str = ""
+    related: List[Tuple[str, str]] = field(default_factory=list)
+    fingerprint: int = 0
+
+@dataclass
+class Document:
+    """Format-neutral newsletter shared by all generators.
+    
+    ``entries`` is a lazy iterator, so building a document costs nothing up
+    front and it can be consumed once, either by a single generator's
+    render() or by render_all() feeding several generators together.
+    """
+    title: str
+    date: datetime
+    item_count: int
+    entries: Iterator[Entry]
+
+def _summaries(item: NewsItem) -> Tuple[str, str]:
+    """Plain-text and safe HTML forms of an item's summary"""
+    if item.summary_is_html:
+        return html_to_text(item.summary), sanitize_html(item.summary)
+    return item.summary, escape(item.summary)
+
+def _entries(items: Sequence[NewsItem]) -> Iterator[Entry]:
+    for i, item in enumerate(items, 1):
+        summary, summary_html = _summaries(item)
+        yield Entry(
+            index=i,
+            title=item.title,
+            # Links get the same scheme allowlist as links inside summaries
+            url=safe_url(item.url),
+            source=item.source,
+            summary=summary,
+            summary_html=summary_html,
+            score=item.score,
+            published=time.strftime('%Y-%m-%d %H:%M', time.gmtime(item.published_ts)) if item.published_ts is not None else "",
+            related=[(other.source or other.title, safe_url(other.url)) for other in item.related],
+            fingerprint=item_fingerprint(item)
+        )
+
+def build_document(items: Sequence[NewsItem], title: str = "Your Daily Newsletter") -> Document:
+    """Wrap ranked items in the intermediate document model"""
+    now = datetime.now()
+    return Document(
+        title=f"{title} - {now.strftime('%Y-%m-%d')}",
+        date=now,
+        item_count=len(items),
+        entries=_entries(items)
+    )
+
+class NewsletterGenerator:
+    """Renders a Document in one output format.
+    
+    Subclasses supply the header, one fragment per entry and the footer;
+    render() streams them in order.
+    """
+    name = ""
+    extension = ""
+    media_type = "text/plain"
+    
+    def header(self, document: Document) -> str:
+        raise NotImplementedError
+    
+    def entry(self, entry: Entry) -> str:
+        raise NotImplementedError
+    
+    def footer(self, document: Document) -> str:
+        raise NotImplementedError
+    
+    def render(self, document: Document) -> Iterator[str]:
+        yield self.header(document)
+        for entry in document.entries:
+            yield self.entry(entry)
+        yield self.footer(document)
+
+def render_all(document: Document, outputs: Sequence[Tuple[NewsletterGenerator, Callable[[str], object]]]):
+    """Render several formats in a single pass over the document's entries.
+    
+    ``outputs`` pairs each generator with a write callable (a file's write
+    method, a list's append, ...) that receives its chunks as they are made.
+    """
+    for generator, write in outputs:
+        write(generator.header(document))
+    for entry in document.entries:
+        for generator, write in outputs:
+            write(generator.entry(entry))
+    for generator, write in outputs:
+        write(generator.footer(document))
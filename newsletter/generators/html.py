@@ -0,0 +1,130 @@
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime
+from html import escape
+from typing import Optional, Tuple
+
+try:
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+    from markupsafe import Markup
+    JINJA2_AVAILABLE = True
+except ImportError:
+    JINJA2_AVAILABLE = False
+
+from .base import Document, Entry, NewsletterGenerator
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+class HTMLGenerator(NewsletterGenerator):
+    """HTML newsletter suitable for email bodies.
+    
+    Rendering uses the Jinja2 templates in ``templates/`` when Jinja2 is
+    installed. Templates are compiled once per generator, and with
+    ``bytecode_cache_dir`` the compiled bytecode is kept on disk, so later
+    processes skip compilation too. Items are rendered as list entries
+    without their rank, which the ordered list supplies, so each item's
+    fragment is cached by fingerprint and reused by every newsletter that
+    includes it.
+    """
+    name = "html"
+    extension = ".html"
+    media_type = "text/html"
+    
+    def __init__(self, bytecode_cache_dir: Optional[str] = None, fragment_cache_size: int = 10000):
+        self.fragment_cache_size = fragment_cache_size
+        self._fragments: "OrderedDict[int, Tuple[Tuple, str]]" = OrderedDict()
+        self.fragment_hits = 0
+        self.fragment_misses = 0
+        self.env = None
+        
+        if JINJA2_AVAILABLE:
+            bytecode_cache = None
+            if bytecode_cache_dir:
+                os.makedirs(bytecode_cache_dir, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+            
+            self.env = Environment(
+                loader=FileSystemLoader(TEMPLATE_DIR),
+                autoescape=select_autoescape(["html"]),
+                bytecode_cache=bytecode_cache,
+                keep_trailing_newline=True,
+                auto_reload=False
+            )
+            self._header = self.env.get_template("header.html")
+            self._item = self.env.get_template("item.html")
+            self._footer = self.env.get_template("footer.html")
+        else:
+            logger.info("Jinja2 not installed, rendering HTML without templates")
+    
+    def header(self, document: Document) -> str:
+        if self.env:
+            return self._header.render(document=document)
+        
+        title = escape(document.title)
+        return (
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{title}</title>\n</head>\n<body>\n"
+            f"<h1>{title}</h1>\n<h2>Top Highlights ({document.item_count} items)</h2>\n"
+            "<ol class=\"items\">\n"
+        )
+    
+    def entry(self, entry: Entry) -> str:
+        # The fingerprint names the story; the content check catches a
+        # story whose score or coverage changed since it was cached
+        content = (entry.title, entry.url, entry.source, entry.summary_html, entry.score,
+                   entry.published, tuple(entry.related))
+        cached = self._fragments.get(entry.fingerprint)
+        if cached is not None and cached[0] == content:
+            self._fragments.move_to_end(entry.fingerprint)
+            self.fragment_hits += 1
+            return cached[1]
+        
+        self.fragment_misses += 1
+        if self.env:
+            # summary_html is already escaped or sanitized by _entries, so
+            # it is the only value the template does not autoescape
+            fragment = self._item.render(entry=entry, summary=Markup(entry.summary_html))
+        else:
+            fragment = self._render_entry(entry)
+        self._fragments[entry.fingerprint] = (content, fragment)
+        self._fragments.move_to_end(entry.fingerprint)
+        if len(self._fragments) > self.fragment_cache_size:
+            self._fragments.popitem(last=False)
+        return fragment
+    
+    def _render_entry(self, entry: Entry) -> str:
+        parts = [
+            "<li>",
+            f"<h3>{escape(entry.title)}</h3>",
+            f"<p><strong>Source:</strong> {escape(entry.source)}</p>"
+        ]
+        
+        if entry.summary_html:
+            parts.append(f"<p><strong>Summary:</strong> {entry.summary_html}</p>")
+        
+        parts.append(f"<p><strong>Link:</strong> <a href=\"{escape(entry.url)}\">{escape(entry.title)}</a></p>")
+        
+        if entry.related:
+            also = ", ".join(f"<a href=\"{escape(url)}\">{escape(label)}</a>" for label, url in entry.related)
+            parts.append(f"<p><strong>Also covered by:</strong> {also}</p>")
+        
+        if entry.score > 0:
+            parts.append(f"<p><strong>Score:</strong> {entry.score}</p>")
+        
+        if entry.published:
+            parts.append(f"<p><strong>Published:</strong> {entry.published}</p>")
+        
+        parts.append("</li>\n")
+        return "\n".join(parts)
+    
+    def footer(self, document: Document) -> str:
+        if self.env:
+            return self._footer.render(generated_at=datetime.now())
+        
+        return (
+            f"</ol>\n<p><em>Generated by your AI Newsletter Agent at "
+            f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</em></p>\n</body>\n</html>\n"
+        )
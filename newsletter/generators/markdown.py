@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from .base import Document, Entry, NewsletterGenerator
+
+class MarkdownGenerator(NewsletterGenerator):
+    """Markdown newsletter, the format saved by default"""
+    name = "markdown"
+    extension = ".md"
+    media_type = "text/markdown"
+    
+    def header(self, document: Document) -> str:
+        return f"""# {document.title}
+
+## Top Highlights ({document.item_count} items)
+
+"""
+    
+    def entry(self, entry: Entry) -> str:
+        lines = [f"### {entry.index}. {entry.title}", f"**Source:** {entry.source}"]
+        
+        if entry.summary:
+            lines.append(f"**Summary:** {entry.summary}")
+        
+        lines.append(f"**Link:** [{entry.title}]({entry.url})")
+        
+        if entry.related:
+            also = ", ".join(f"[{label}]({url})" for label, url in entry.related)
+            lines.append(f"**Also covered by:** {also}")
+        
+        if entry.score > 0:
+            lines.append(f"**Score:** {entry.score}")
+        
+        if entry.published:
+            lines.append(f"**Published:** {entry.published}")
+        
+        return "\n".join(lines) + "\n\n---\n\n"
+    
+    def footer(self, document: Document) -> str:
+        return f"""
+*Generated by your AI Newsletter Agent at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+"""
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from .base import Document, Entry, NewsletterGenerator
+
+class TextGenerator(NewsletterGenerator):
+    """Plain-text newsletter for email clients without HTML"""
+    name = "text"
+    extension = ".txt"
+    media_type = "text/plain"
+    
+    def header(self, document: Document) -> str:
+        heading = f"Top Highlights ({document.item_count} items)"
+        return f"{document.title}\n{'=' * len(document.title)}\n\n{heading}\n{'-' * len(heading)}\n\n"
+    
+    def entry(self, entry: Entry) -> str:
+        lines = [f"{entry.index}. {entry.title}", f"   Source: {entry.source}"]
+        
+        if entry.summary:
+            lines.append(f"   Summary: {entry.summary}")
+        
+        lines.append(f"   Link: {entry.url}")
+        
+        if entry.related:
+            also = ", ".join(f"{label} <{url}>" for label, url in entry.related)
+            lines.append(f"   Also covered by: {also}")
+        
+        if entry.score > 0:
+            lines.append(f"   Score: {entry.score}")
+        
+        if entry.published:
+            lines.append(f"   Published: {entry.published}")
+        
+        return "\n".join(lines) + "\n\n"
+    
+    def footer(self, document: Document) -> str:
+        return f"--\nGenerated by your AI Newsletter Agent at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
@@ -1,34 +1,114 @@
-from dataclasses import dataclass, field
-from datetime import datetime
+import sys
+from datetime import datetime, timezone
 from typing import List, Optional
 
-@dataclass
+from .utils.filters import KeywordMatcher
+
 class NewsItem:
-    """Represents a single news item from any source"""
-    title: str
-    url: str
-    summary: str = ""
-    source: str = ""
-    published_at: Optional[datetime] = None
-    score: int = 0
-    category: str = ""
-    keywords: List[str] = field(default_factory=list)
-    
-    def __post_init__(self):
-        pass
+    """Represents a single news item from any source
+    
+    Stored compactly: no per-instance __dict__, ``source`` and ``category``
+    interned (they repeat across thousands of items), the publish time kept
+    as integer UTC epoch seconds in ``published_ts``, and the ``keywords``
+    and ``related`` lists only allocated once they are first used. The
+    constructor and attributes match the former dataclass.
+    
+    Sources set ``published_ts`` at ingestion, and sorting, decay and range
+    checks compare those integers, so naive and aware times never meet.
+    ``published_at`` is derived from it as an aware UTC datetime.
+    """
+    
+    __slots__ = ('title', 'url', 'summary', '_source', 'published_ts',
+                 'score', '_category', '_keywords', '_related', 'summary_is_html', 'rank_score')
+    
+    def __init__(self, title: str, url: str, summary: str = "", source: str = "",
+                 published_at: Optional[datetime] = None, score: int = 0, category: str = "",
+                 keywords: Optional[List[str]] = None, published_ts: Optional[int] = None,
+                 summary_is_html: bool = False):
+        self.title = title
+        self.url = url
+        self.summary = summary
+        self.source = source
+        if published_ts is not None:
+            self.published_ts = int(published_ts)
+        else:
+            self.published_at = published_at
+        self.score = score
+        self.category = category
+        self._keywords = keywords or None
+        self._related = None
+        # Set by sources whose summaries are HTML markup rather than plain text
+        self.summary_is_html = summary_is_html
+        # Normalized, time-decayed score, set by the agent before merging
+        self.rank_score: Optional[float] = None
+    
+    @property
+    def source(self) -> str:
+        return self._source
+    
+    @source.setter
+    def source(self, value: str):
+        self._source = sys.intern(value) if value else ""
+    
+    @property
+    def category(self) -> str:
+        return self._category
+    
+    @category.setter
+    def category(self, value: str):
+        self._category = sys.intern(value) if value else ""
+    
+    @property
+    def published_at(self) -> Optional[datetime]:
+        """Publish time as an aware UTC datetime"""
+        if self.published_ts is None:
+            return None
+        return datetime.fromtimestamp(self.published_ts, timezone.utc)
+    
+    @published_at.setter
+    def published_at(self, value: Optional[datetime]):
+        if value is None:
+            self.published_ts = None
+        elif value.tzinfo is None:
+            # Naive values are taken as UTC, which is what feeds and APIs report
+            self.published_ts = int(value.replace(tzinfo=timezone.utc).timestamp())
+        else:
+            self.published_ts = int(value.timestamp())
+    
+    @property
+    def keywords(self) -> List[str]:
+        if self._keywords is None:
+            self._keywords = []
+        return self._keywords
+    
+    @keywords.setter
+    def keywords(self, value: List[str]):
+        self._keywords = value
+    
+    @property
+    def related(self) -> List["NewsItem"]:
+        """Other sources' coverage of the same story, merged into this item"""
+        if self._related is None:
+            self._related = []
+        return self._related
+    
+    def _fields(self) -> tuple:
+        return (self.title, self.url, self.summary, self.source, self.published_ts,
+                self.score, self.category, self._keywords or [])
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (f"NewsItem(title={self.title!r}, url={self.url!r}, summary={self.summary!r}, "
+                f"source={self.source!r}, published_at={self.published_at!r}, score={self.score!r}, "
+                f"category={self.category!r}, keywords={self._keywords or []!r})")
     
     def matches_keywords(self, include_keywords: List[str], exclude_keywords: List[str]) -> bool:
         """Check if item matches keyword filters"""
-        text_to_check = f"{self.title} {self.summary}".lower()
-        
-        # Include keywords (if specified)
-        if include_keywords:
-            if not any(keyword.lower() in text_to_check for keyword in include_keywords):
-                return False
-        
-        # Exclude keywords
-        if exclude_keywords:
-            if any(keyword.lower() in text_to_check for keyword in exclude_keywords):
-                return False
-        
-        return True
\ No newline at end of file
+        matcher = KeywordMatcher.compile(tuple(include_keywords), tuple(exclude_keywords))
+        return matcher.matches(f"{self.title} {self.summary}")
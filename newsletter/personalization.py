@@ -0,0 +1,182 @@
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .models import NewsItem
+from .utils.scoring import BatchScorer, ScoringWeights
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Longest substrings indexed per word; longer fragments intersect these
+GRAM_SIZE = 3
+
+@dataclass
+class Subscriber:
+    """One reader's delivery address and preferences"""
+    id: str
+    email: str = ""
+    include_keywords: List[str] = field(default_factory=list)
+    exclude_keywords: List[str] = field(default_factory=list)
+    min_score: int = 0
+    max_items: int = 10
+    
+    @classmethod
+    def from_config(cls, config: Dict, defaults: Dict) -> "Subscriber":
+        """Build a subscriber, taking unset preferences from ``defaults``"""
+        subscriber_id = config.get("id") or config.get("email")
+        if not subscriber_id:
+            raise ValueError(f"Subscriber needs an id or an email: {config!r}")
+        return cls(
+            id=str(subscriber_id),
+            email=config.get("email", ""),
+            include_keywords=config.get("include_keywords", defaults.get("include_keywords", [])),
+            exclude_keywords=config.get("exclude_keywords", defaults.get("exclude_keywords", [])),
+            min_score=config.get("min_score", defaults.get("min_score", 0)),
+            max_items=config.get("max_items", defaults.get("max_items", 10))
+        )
+
+class PersonalizationEngine:
+    """Selects each subscriber's newsletter from one shared corpus.
+    
+    The corpus is sorted once by ``key`` (best first), so an item's
+    position is its global rank, and an inverted index maps every word of
+    the lowercased title and summary to the positions containing it.
+    
+    Keywords keep KeywordMatcher's substring semantics. A keyword resolves
+    to the postings of every indexed word containing it, and keywords that
+    span words are confirmed against the text of the candidates. Words
+    containing a fragment are found through a second index from every
+    substring of up to three characters to the words containing it, so a
+    lookup intersects a few posting lists instead of scanning the whole
+    vocabulary. Each
+    keyword is resolved once and shared by every subscriber using it, so a
+    subscriber costs set operations over their matches, plus a walk down
+    the ranking for subscribers without include keywords, instead of a
+    pass over the corpus.
+    """
+    
+    def __init__(self, items: Iterable[NewsItem], key: Callable[[NewsItem], Any]):
+        self.items: List[NewsItem] = sorted(items, key=key, reverse=True)
+        self._texts = [f"{item.title} {item.summary}".lower() for item in self.items]
+        self._index: Dict[str, List[int]] = {}
+        for position, text in enumerate(self._texts):
+            for token in set(TOKEN_RE.findall(text)):
+                self._index.setdefault(token, []).append(position)
+        self._tokens = list(self._index)
+        self._grams: Dict[str, List[int]] = {}
+        for token_id, token in enumerate(self._tokens):
+            grams = {token[start:start + size] for size in range(1, GRAM_SIZE + 1)
+                     for start in range(len(token) - size + 1)}
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(token_id)
+        self._keyword_matches: Dict[str, FrozenSet[int]] = {}
+        self._keyword_arrays: Dict[str, np.ndarray] = {}
+        self._all = frozenset(range(len(self.items)))
+        
+        logger.info(f"Indexed {len(self.items)} items under {len(self._index)} terms")
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def _tokens_containing(self, fragment: str) -> List[str]:
+        """Indexed words containing ``fragment``"""
+        if len(fragment) <= GRAM_SIZE:
+            return [self._tokens[token_id] for token_id in self._grams.get(fragment, ())]
+        
+        postings = []
+        for start in range(len(fragment) - GRAM_SIZE + 1):
+            token_ids = self._grams.get(fragment[start:start + GRAM_SIZE])
+            if token_ids is None:
+                return []
+            postings.append(token_ids)
+        postings.sort(key=len)
+        
+        # Sharing every trigram does not guarantee containment, so confirm
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return [self._tokens[token_id] for token_id in candidates if fragment in self._tokens[token_id]]
+    
+    def _token_matches(self, fragment: str) -> FrozenSet[int]:
+        """Positions with a word containing ``fragment``"""
+        positions = set()
+        for token in self._tokens_containing(fragment):
+            positions.update(self._index[token])
+        return frozenset(positions)
+    
+    def keyword_matches(self, keyword: str) -> FrozenSet[int]:
+        """Positions whose text contains ``keyword``, as KeywordMatcher would find it"""
+        keyword = keyword.lower()
+        matches = self._keyword_matches.get(keyword)
+        if matches is not None:
+            return matches
+        
+        fragments = TOKEN_RE.findall(keyword)
+        if not keyword:
+            matches = frozenset()
+        elif fragments == [keyword]:
+            # A keyword made only of word characters always lies inside one word
+            matches = self._token_matches(keyword)
+        else:
+            candidates = self._all
+            for fragment in fragments:
+                candidates = candidates & self._token_matches(fragment)
+            matches = frozenset(position for position in candidates if keyword in self._texts[position])
+        
+        self._keyword_matches[keyword] = matches
+        return matches
+    
+    def _union(self, keywords: Sequence[str]) -> FrozenSet[int]:
+        if len(keywords) == 1:
+            return self.keyword_matches(keywords[0])
+        return frozenset().union(*(self.keyword_matches(keyword) for keyword in keywords))
+    
+    def select(self, subscriber: Subscriber) -> List[NewsItem]:
+        """The subscriber's top items in rank order"""
+        include = [keyword for keyword in subscriber.include_keywords if keyword]
+        exclude = self._union([keyword for keyword in subscriber.exclude_keywords if keyword])
+        
+        if include:
+            positions = sorted(self._union(include) - exclude)
+        else:
+            positions = (position for position in range(len(self.items)) if position not in exclude)
+        
+        selected = []
+        for position in positions:
+            if len(selected) >= subscriber.max_items:
+                break
+            item = self.items[position]
+            if item.score < subscriber.min_score:
+                continue
+            selected.append(item)
+        return selected
+    
+    def select_all(self, subscribers: Iterable[Subscriber]) -> Dict[str, List[NewsItem]]:
+        """Newsletters for many subscribers, keyed by subscriber ID"""
+        return {subscriber.id: self.select(subscriber) for subscriber in subscribers}
+    
+    def keyword_positions(self, keyword: str) -> np.ndarray:
+        """``keyword_matches`` as an index array for NumPy"""
+        keyword = keyword.lower()
+        positions = self._keyword_arrays.get(keyword)
+        if positions is None:
+            matches = self.keyword_matches(keyword)
+            positions = np.fromiter(matches, dtype=np.intp, count=len(matches))
+            self._keyword_arrays[keyword] = positions
+        return positions
+    
+    def rank_all(self, subscribers: Sequence[Subscriber], weights: Optional[ScoringWeights] = None,
+                 chunk_size: int = 512, item_scores: Optional[Sequence[float]] = None) -> Dict[str, List[NewsItem]]:
+        """Rank every subscriber at once with the vectorized relevance model.
+        
+        ``item_scores`` gives each item's relevance before keyword hits, in
+        ``items`` order, as ScoringWeights.item_scores computes it. With
+        default weights and item scores that agree with the sort key, this
+        returns the same newsletters as select_all(). Other weights blend in
+        keyword hits, age and per-source weights; see ScoringWeights.
+        """
+        scorer = BatchScorer(self.items, self.keyword_positions, weights, item_scores=item_scores)
+        return {subscriber.id: items for subscriber, items in scorer.rank(list(subscribers), chunk_size)}
@@ -1,5 +1,8 @@
+import asyncio
+import json
 import os
-from typing import List
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
 import logging
 
 try:
@@ -7,6 +10,7 @@ try:
     from google.oauth2.credentials import Credentials
     from google_auth_oauthlib.flow import InstalledAppFlow
     from googleapiclient.discovery import build
+    from googleapiclient.errors import HttpError
     GMAIL_AVAILABLE = True
 except ImportError:
     GMAIL_AVAILABLE = False
@@ -15,19 +19,27 @@ from ..models import NewsItem
 
 logger = logging.getLogger(__name__)
 
+# Gmail rejects batches larger than 100 and throttles above ~50
+BATCH_SIZE = 50
+
+# Incremental searches reach this far before the last sync, for mail whose
+# receive time is slightly earlier than when it was added to the mailbox
+SYNC_SEARCH_SLACK = 3600
+
 class GmailSource:
     """Fetches important emails from Gmail"""
     
-    def __init__(self, query: str = "from:newsletters OR subject:important", max_items: int = 5):
+    def __init__(self, query: str = "from:newsletters OR subject:important", max_items: int = 5,
+                 sync_state_path: str = "gmail_sync.json"):
         self.query = query
         self.max_items = max_items
+        self.sync_state_path = sync_state_path
+        # Built on first fetch, in the worker thread, since authentication
+        # may refresh a token or wait for the browser consent flow
         self.gmail_service = None
-        
-        if GMAIL_AVAILABLE:
-            self._setup_gmail()
     
     def _setup_gmail(self):
-        """Setup Gmail API authentication"""
+        """Setup Gmail API authentication (blocking)"""
         SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
         creds = None
         
@@ -69,47 +81,167 @@ class GmailSource:
         except Exception as e:
             logger.error(f"Error building Gmail service: {e}")
     
+    def _fetch_metadata(self, message_ids: List[str]) -> List[Dict]:
+        """Fetch Subject/From headers for many messages via batched requests"""
+        responses = {}
+        
+        def on_response(request_id, response, exception):
+            if exception:
+                logger.error(f"Error processing Gmail message {request_id}: {exception}")
+                return
+            responses[request_id] = response
+        
+        messages_api = self.gmail_service.users().messages()
+        for start in range(0, len(message_ids), BATCH_SIZE):
+            batch = self.gmail_service.new_batch_http_request(callback=on_response)
+            for message_id in message_ids[start:start + BATCH_SIZE]:
+                batch.add(
+                    messages_api.get(
+                        userId='me', id=message_id, format='metadata',
+                        metadataHeaders=['Subject', 'From']
+                    ),
+                    request_id=message_id
+                )
+            batch.execute()
+        
+        # Keep the list order, which is newest first
+        return [responses[message_id] for message_id in message_ids if message_id in responses]
+    
+    def _load_sync_state(self) -> Dict[str, Any]:
+        """Load the last sync checkpoint per account"""
+        if not os.path.exists(self.sync_state_path):
+            return {}
+        try:
+            with open(self.sync_state_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading Gmail sync state: {e}")
+            return {}
+    
+    def _save_sync_state(self, state: Dict[str, Any]):
+        try:
+            tmp_path = f"{self.sync_state_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.sync_state_path)
+        except OSError as e:
+            logger.error(f"Error saving Gmail sync state: {e}")
+    
+    def _fetch_added_since(self, start_history_id: str) -> Optional[Set[str]]:
+        """IDs of messages added since a history ID, or None if it has expired"""
+        added = set()
+        page_token = None
+        
+        while True:
+            try:
+                response = self.gmail_service.users().history().list(
+                    userId='me', startHistoryId=start_history_id,
+                    historyTypes=['messageAdded'], pageToken=page_token
+                ).execute()
+            except HttpError as e:
+                # Gmail answers 404 once a history ID is too old to replay
+                if e.resp.status == 404:
+                    return None
+                raise
+            
+            for record in response.get('history', []):
+                for added_message in record.get('messagesAdded', []):
+                    added.add(added_message['message']['id'])
+            
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return added
+    
+    def _list_message_ids(self, after: Optional[int] = None) -> List[str]:
+        query = self.query
+        if after is not None:
+            query = f"({query}) after:{after - SYNC_SEARCH_SLACK}"
+        results = self.gmail_service.users().messages().list(
+            userId='me', q=query, maxResults=self.max_items
+        ).execute()
+        return [message['id'] for message in results.get('messages', [])]
+    
+    def _fetch_items(self) -> Tuple[List[NewsItem], Optional[str], Optional[Dict[str, Any]]]:
+        """Blocking Gmail calls; run in a worker thread by fetch().
+        
+        Returns the items with the account and its new sync checkpoint,
+        which fetch() saves once the results have been handed over.
+        """
+        if not self.gmail_service:
+            self._setup_gmail()
+            if not self.gmail_service:
+                logger.warning("Gmail service not configured. Skipping Gmail.")
+                return [], None, None
+        
+        # Read the current history ID first so nothing added during this
+        # run falls between it and the next checkpoint
+        synced_at = int(time.time())
+        profile = self.gmail_service.users().getProfile(userId='me').execute()
+        account = profile['emailAddress']
+        
+        checkpoint = self._load_sync_state().get(account)
+        if isinstance(checkpoint, str):
+            # Checkpoints saved before sync times were recorded
+            checkpoint = {'history_id': checkpoint}
+        added = None
+        if checkpoint:
+            added = self._fetch_added_since(checkpoint['history_id'])
+            if added is None:
+                logger.info("Gmail sync checkpoint expired. Running full query.")
+        
+        if added is None:
+            message_ids = self._list_message_ids()
+        elif added:
+            # History has no search filter, so search only mail received
+            # since the last sync and keep the new messages it matches
+            message_ids = [
+                message_id for message_id in self._list_message_ids(checkpoint.get('synced_at'))
+                if message_id in added
+            ]
+        else:
+            message_ids = []
+        
+        items = []
+        for msg in self._fetch_metadata(message_ids):
+            headers = msg.get('payload', {}).get('headers', [])
+            subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
+            sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown')
+            
+            item = NewsItem(
+                title=f"Email: {subject}",
+                url=f"https://mail.google.com/mail/u/0/#inbox/{msg['id']}",
+                summary=f"From: {sender}",
+                source='Gmail',
+                score=0,
+                # internalDate is when Gmail received the message, in epoch milliseconds
+                published_ts=int(msg['internalDate']) // 1000 if msg.get('internalDate') else None
+            )
+            items.append(item)
+        
+        return items, account, {'history_id': profile['historyId'], 'synced_at': synced_at}
+    
+    def _save_checkpoint(self, account: str, checkpoint: Dict[str, Any]):
+        sync_state = self._load_sync_state()
+        sync_state[account] = checkpoint
+        self._save_sync_state(sync_state)
+    
     async def fetch(self) -> List[NewsItem]:
         """Fetch important emails from Gmail"""
         if not GMAIL_AVAILABLE:
             logger.warning("Google API libraries not installed. Skipping Gmail.")
             return []
         
-        if not self.gmail_service:
-            logger.warning("Gmail service not configured. Skipping Gmail.")
-            return []
-        
         try:
             logger.info("Fetching from Gmail...")
             
-            results = self.gmail_service.users().messages().list(
-                userId='me', q=self.query, maxResults=self.max_items
-            ).execute()
-            
-            items = []
-            messages = results.get('messages', [])
+            # The Google client and its authentication are synchronous, so
+            # keep them off the event loop
+            items, account, checkpoint = await asyncio.to_thread(self._fetch_items)
             
-            for message in messages:
-                try:
-                    msg = self.gmail_service.users().messages().get(
-                        userId='me', id=message['id']
-                    ).execute()
-                    
-                    headers = msg['payload'].get('headers', [])
-                    subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-                    sender = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown')
-                    
-                    item = NewsItem(
-                        title=f"Email: {subject}",
-                        url=f"https://mail.google.com/mail/u/0/#inbox/{message['id']}",
-                        summary=f"From: {sender}",
-                        source='Gmail',
-                        score=0
-                    )
-                    items.append(item)
-                except Exception as e:
-                    logger.error(f"Error processing Gmail message: {e}")
-                    continue
+            # Saved here rather than in the worker, so a fetch the caller
+            # cancelled or timed out does not skip the messages it found
+            if account:
+                self._save_checkpoint(account, checkpoint)
             
             logger.info(f"Successfully fetched {len(items)} emails from Gmail")
             return items
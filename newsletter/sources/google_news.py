@@ -1,17 +1,20 @@
 import aiohttp
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import logging
 
 from ..models import NewsItem
+from ..utils.http_cache import HTTPCache
 
 logger = logging.getLogger(__name__)
 
 class GoogleNewsSource:
     """Fetches news from Google News API (NewsAPI.org)"""
     
-    def __init__(self, session: aiohttp.ClientSession, api_key: str, max_items: int = 10):
+    def __init__(self, session: aiohttp.ClientSession, api_key: str, max_items: int = 10,
+                 cache: Optional[HTTPCache] = None):
         self.session = session
+        self.cache = cache or HTTPCache()
         self.api_key = api_key
         self.max_items = max_items
     
@@ -31,46 +34,46 @@ class GoogleNewsSource:
         try:
             logger.info("Fetching from Google News API...")
             
-            async with self.session.get(url, params=params) as response:
-                if response.status != 200:
-                    logger.error(f"Google News API error: {response.status}")
-                    return []
-                
-                data = await response.json()
-                
-                if data.get('status') != 'ok':
-                    logger.error(f"Google News API error: {data.get('message', 'Unknown error')}")
-                    return []
-                
-                items = []
-                for article in data.get('articles', []):
-                    # Skip articles without URLs
-                    if not article.get('url'):
-                        continue
-                    
-                    # Parse publication date
-                    published_at = None
-                    if article.get('publishedAt'):
-                        try:
-                            published_at = datetime.fromisoformat(
-                                article['publishedAt'].replace('Z', '+00:00')
-                            )
-                        except ValueError:
-                            pass
-                    
-                    item = NewsItem(
-                        title=article['title'],
-                        url=article['url'],
-                        summary=article.get('description', ''),
-                        source=f"Google News ({article.get('source', {}).get('name', 'Unknown')})",
-                        published_at=published_at,
-                        score=0
-                    )
-                    items.append(item)
+            data = await self.cache.get(self.session, url, params=params, namespace='google_news')
+            
+            if data.get('status') != 'ok':
+                logger.error(f"Google News API error: {data.get('message', 'Unknown error')}")
+                return []
+            
+            items = []
+            for article in data.get('articles', []):
+                # Skip articles without URLs
+                if not article.get('url'):
+                    continue
                 
-                logger.info(f"Successfully fetched {len(items)} articles from Google News")
-                return items
+                # Parse publication date
+                published_ts = None
+                if article.get('publishedAt'):
+                    try:
+                        published_ts = int(datetime.fromisoformat(
+                            article['publishedAt'].replace('Z', '+00:00')
+                        ).timestamp())
+                    except ValueError:
+                        pass
                 
+                item = NewsItem(
+                    title=article['title'],
+                    url=article['url'],
+                    summary=article.get('description', ''),
+                    # NewsAPI descriptions may carry markup from the publisher
+                    summary_is_html=True,
+                    source=f"Google News ({article.get('source', {}).get('name', 'Unknown')})",
+                    published_ts=published_ts,
+                    score=0
+                )
+                items.append(item)
+            
+            logger.info(f"Successfully fetched {len(items)} articles from Google News")
+            return items
+            
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"Google News API error: {e.status}")
+            return []
         except Exception as e:
             logger.error(f"Error fetching Google News: {e}")
             return []
\ No newline at end of file
@@ -1,54 +1,70 @@
+import asyncio
 import aiohttp
-from datetime import datetime
-from typing import List
+from typing import List, Optional
 import logging
 
 from ..models import NewsItem
+from ..utils.http_cache import HTTPCache
 
 logger = logging.getLogger(__name__)
 
 class HackerNewsSource:
     """Fetches top stories from Hacker News"""
     
-    def __init__(self, session: aiohttp.ClientSession, max_items: int = 10):
+    def __init__(self, session: aiohttp.ClientSession, max_items: int = 10,
+                 story_limit: int = 20, max_concurrency: int = 10, cache: Optional[HTTPCache] = None):
         self.session = session
+        self.cache = cache or HTTPCache()
         self.max_items = max_items
+        self.story_limit = story_limit
+        self.max_concurrency = max_concurrency
+    
+    async def _fetch_story(self, story_id: int, semaphore: asyncio.Semaphore) -> Optional[NewsItem]:
+        """Fetch a single story, holding a semaphore slot for the request"""
+        try:
+            async with semaphore:
+                story = await self.cache.get(
+                    self.session,
+                    f'https://hacker-news.firebaseio.com/v0/item/{story_id}.json',
+                    namespace='hackernews_items'
+                )
+            
+            if story and story.get('type') == 'story':
+                return NewsItem(
+                    title=story['title'],
+                    url=story.get('url', f'https://news.ycombinator.com/item?id={story_id}'),
+                    summary='',
+                    source='Hacker News',
+                    published_ts=story['time'],
+                    score=story.get('score', 0)
+                )
+        except Exception as e:
+            logger.error(f"Error fetching HN story {story_id}: {e}")
+        return None
     
     async def fetch(self) -> List[NewsItem]:
         """Fetch top stories from Hacker News"""
         try:
             # Get top story IDs
-            async with self.session.get('https://hacker-news.firebaseio.com/v0/topstories.json') as response:
-                story_ids = await response.json()
+            story_ids = await self.cache.get(
+                self.session, 'https://hacker-news.firebaseio.com/v0/topstories.json', namespace='hackernews'
+            )
             
-            # Fetch details for top stories
-            items = []
-            max_items = min(self.max_items, 20)
+            # Fetch details for top stories concurrently, bounded by the semaphore
+            max_items = min(self.max_items, self.story_limit)
+            semaphore = asyncio.Semaphore(self.max_concurrency)
             
             logger.info(f"Fetching {max_items} stories from Hacker News...")
             
-            for story_id in story_ids[:max_items]:
-                try:
-                    async with self.session.get(f'https://hacker-news.firebaseio.com/v0/item/{story_id}.json') as response:
-                        story = await response.json()
-                    
-                    if story and story.get('type') == 'story':
-                        item = NewsItem(
-                            title=story['title'],
-                            url=story.get('url', f'https://news.ycombinator.com/item?id={story_id}'),
-                            summary='',
-                            source='Hacker News',
-                            published_at=datetime.fromtimestamp(story['time']),
-                            score=story.get('score', 0)
-                        )
-                        items.append(item)
-                except Exception as e:
-                    logger.error(f"Error fetching HN story {story_id}: {e}")
-                    continue
+            # gather preserves the topstories order regardless of completion order
+            stories = await asyncio.gather(
+                *(self._fetch_story(story_id, semaphore) for story_id in story_ids[:max_items])
+            )
+            items = [item for item in stories if item is not None]
             
             logger.info(f"Successfully fetched {len(items)} stories from Hacker News")
             return items
             
         except Exception as e:
             logger.error(f"Error fetching Hacker News: {e}")
-            return []
\ No newline at end of file
+            return []
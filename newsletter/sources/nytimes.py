@@ -1,17 +1,20 @@
 import aiohttp
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Optional
 import logging
 
 from ..models import NewsItem
+from ..utils.http_cache import HTTPCache
 
 logger = logging.getLogger(__name__)
 
 class NYTimesSource:
     """Fetches articles from New York Times API"""
     
-    def __init__(self, session: aiohttp.ClientSession, api_key: str, max_items: int = 10):
+    def __init__(self, session: aiohttp.ClientSession, api_key: str, max_items: int = 10,
+                 cache: Optional[HTTPCache] = None):
         self.session = session
+        self.cache = cache or HTTPCache()
         self.api_key = api_key
         self.max_items = max_items
     
@@ -27,40 +30,41 @@ class NYTimesSource:
         try:
             logger.info("Fetching from New York Times API...")
             
-            async with self.session.get(url, params=params) as response:
-                if response.status != 200:
-                    logger.error(f"NYT API error: {response.status}")
-                    return []
-                
-                data = await response.json()
-                
-                items = []
-                for article in data.get('results', [])[:self.max_items]:
-                    # Skip articles without URLs
-                    if not article.get('url'):
-                        continue
-                    
-                    # Parse publication date
-                    published_at = None
-                    if article.get('published_date'):
-                        try:
-                            published_at = datetime.fromisoformat(article['published_date'])
-                        except ValueError:
-                            pass
-                    
-                    item = NewsItem(
-                        title=article['title'],
-                        url=article['url'],
-                        summary=article.get('abstract', ''),
-                        source='New York Times',
-                        published_at=published_at,
-                        score=0
-                    )
-                    items.append(item)
+            data = await self.cache.get(self.session, url, params=params, namespace='nytimes')
+            
+            items = []
+            for article in data.get('results', [])[:self.max_items]:
+                # Skip articles without URLs
+                if not article.get('url'):
+                    continue
                 
-                logger.info(f"Successfully fetched {len(items)} articles from NYT")
-                return items
+                # Parse publication date
+                published_ts = None
+                if article.get('published_date'):
+                    try:
+                        published = datetime.fromisoformat(article['published_date'])
+                        if published.tzinfo is None:
+                            published = published.replace(tzinfo=timezone.utc)
+                        published_ts = int(published.timestamp())
+                    except ValueError:
+                        pass
                 
+                item = NewsItem(
+                    title=article['title'],
+                    url=article['url'],
+                    summary=article.get('abstract', ''),
+                    source='New York Times',
+                    published_ts=published_ts,
+                    score=0
+                )
+                items.append(item)
+            
+            logger.info(f"Successfully fetched {len(items)} articles from NYT")
+            return items
+            
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"NYT API error: {e.status}")
+            return []
         except Exception as e:
             logger.error(f"Error fetching NYT: {e}")
             return []
\ No newline at end of file
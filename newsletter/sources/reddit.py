@@ -1,89 +1,117 @@
+import asyncio
+import aiohttp
 import os
-from datetime import datetime
-from typing import List
+import time
+from typing import List, Optional
 import logging
 
-try:
-    import praw
-    PRAW_AVAILABLE = True
-except ImportError:
-    PRAW_AVAILABLE = False
-
 from ..models import NewsItem
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'newsletter_agent/1.0'
+
 class RedditSource:
     """Fetches posts from Reddit subreddits"""
     
-    def __init__(self, subreddits: List[str], posts_per_subreddit: int = 5):
+    def __init__(self, session: aiohttp.ClientSession, subreddits: List[str],
+                 posts_per_subreddit: int = 5, max_concurrency: int = 10):
+        self.session = session
         self.subreddits = subreddits
         self.posts_per_subreddit = posts_per_subreddit
-        self.reddit_client = None
-        
-        if PRAW_AVAILABLE:
-            self._setup_reddit()
+        self.max_concurrency = max_concurrency
+        self.client_id = os.getenv('REDDIT_CLIENT_ID')
+        self.client_secret = os.getenv('REDDIT_CLIENT_SECRET')
+        self._token: Optional[str] = None
+        self._token_expires = 0.0
     
-    def _setup_reddit(self):
-        """Setup Reddit API client"""
-        if not PRAW_AVAILABLE:
-            logger.warning("praw library not installed. Cannot set up Reddit client.")
-            return
-            
-        client_id = os.getenv('REDDIT_CLIENT_ID')
-        client_secret = os.getenv('REDDIT_CLIENT_SECRET')
+    async def _get_access_token(self) -> Optional[str]:
+        """Obtain an application-only OAuth token for the Reddit API.
+        
+        The token is reused until shortly before it expires.
+        """
+        if self._token and time.monotonic() < self._token_expires:
+            return self._token
         
-        if not client_id or not client_secret:
-            logger.warning("Reddit API credentials not found in environment variables")
-            return
+        auth = aiohttp.BasicAuth(self.client_id, self.client_secret)
+        async with self.session.post(
+            'https://www.reddit.com/api/v1/access_token',
+            auth=auth,
+            data={'grant_type': 'client_credentials'},
+            headers={'User-Agent': USER_AGENT}
+        ) as response:
+            if response.status != 200:
+                logger.error(f"Reddit auth error: {response.status}")
+                return None
+            data = await response.json()
         
+        self._token = data.get('access_token')
+        # Renew a minute early so a token never expires mid-run
+        self._token_expires = time.monotonic() + data.get('expires_in', 3600) - 60
+        return self._token
+    
+    async def _fetch_subreddit(self, subreddit_name: str, token: str,
+                               semaphore: asyncio.Semaphore) -> List[NewsItem]:
+        """Fetch the hot listing of a single subreddit"""
         try:
-            self.reddit_client = praw.Reddit(
-                client_id=client_id,
-                client_secret=client_secret,
-                user_agent='newsletter_agent/1.0'
-            )
+            logger.info(f"Fetching from r/{subreddit_name}")
+            
+            async with semaphore:
+                async with self.session.get(
+                    f'https://oauth.reddit.com/r/{subreddit_name}/hot',
+                    params={'limit': self.posts_per_subreddit, 'raw_json': 1},
+                    headers={'Authorization': f'bearer {token}', 'User-Agent': USER_AGENT}
+                ) as response:
+                    if response.status == 401:
+                        # Revoked early; get a new token next time
+                        self._token = None
+                    if response.status != 200:
+                        logger.error(f"Error fetching Reddit r/{subreddit_name}: {response.status}")
+                        return []
+                    listing = await response.json()
+            
+            items = []
+            for child in listing.get('data', {}).get('children', [])[:self.posts_per_subreddit]:
+                submission = child.get('data', {})
+                selftext = submission.get('selftext', '')
+                item = NewsItem(
+                    title=submission['title'],
+                    url=submission['url'],
+                    summary=selftext[:200] if selftext else '',
+                    source=f'Reddit r/{subreddit_name}',
+                    published_ts=int(submission['created_utc']),
+                    score=submission.get('score', 0)
+                )
+                items.append(item)
+            
+            logger.info(f"Fetched {len(items)} posts from r/{subreddit_name}")
+            return items
+        
         except Exception as e:
-            logger.error(f"Error setting up Reddit client: {e}")
+            logger.error(f"Error fetching Reddit r/{subreddit_name}: {e}")
+            return []
     
     async def fetch(self) -> List[NewsItem]:
-        """Fetch posts from Reddit subreddits"""
-        if not PRAW_AVAILABLE:
-            logger.warning("praw library not installed. Skipping Reddit.")
-            return []
-        
-        if not self.reddit_client:
-            logger.warning("Reddit client not configured. Skipping Reddit.")
+        """Fetch posts from all configured subreddits concurrently"""
+        if not self.client_id or not self.client_secret:
+            logger.warning("Reddit API credentials not found in environment variables. Skipping Reddit.")
             return []
         
         try:
-            items = []
+            token = await self._get_access_token()
+            if not token:
+                return []
             
-            for subreddit_name in self.subreddits:
-                try:
-                    logger.info(f"Fetching from r/{subreddit_name}")
-                    subreddit = self.reddit_client.subreddit(subreddit_name)
-                    
-                    for submission in subreddit.hot(limit=self.posts_per_subreddit):
-                        item = NewsItem(
-                            title=submission.title,
-                            url=submission.url,
-                            summary=submission.selftext[:200] if submission.selftext else '',
-                            source=f'Reddit r/{subreddit_name}',
-                            published_at=datetime.fromtimestamp(submission.created_utc),
-                            score=submission.score
-                        )
-                        items.append(item)
-                    
-                    logger.info(f"Fetched {self.posts_per_subreddit} posts from r/{subreddit_name}")
-                    
-                except Exception as e:
-                    logger.error(f"Error fetching Reddit r/{subreddit_name}: {e}")
-                    continue
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            results = await asyncio.gather(
+                *(self._fetch_subreddit(name, token, semaphore) for name in self.subreddits)
+            )
+            
+            items = [item for subreddit_items in results for item in subreddit_items]
             
             logger.info(f"Total Reddit items fetched: {len(items)}")
             return items
-            
+        
         except Exception as e:
             logger.error(f"Error fetching Reddit: {e}")
-            return []
\ No newline at end of file
+            return []
@@ -1,54 +1,108 @@
+import asyncio
+import calendar
+import aiohttp
 import feedparser
-from datetime import datetime
-from typing import List
+from concurrent.futures import Executor
+from typing import Dict, List, Mapping, Optional, Tuple
 import logging
 
 from ..models import NewsItem
+from ..utils.http_cache import HTTPCache
 
 logger = logging.getLogger(__name__)
 
+def _parse_feed(content: bytes, headers: Mapping[str, str], limit: int) -> Tuple[str, List[Dict]]:
+    """Parse raw feed bytes into plain entry dicts.
+    
+    Runs in an executor, so it only takes and returns picklable values and
+    trims the feed to the entries we keep before handing them back.
+    """
+    feed = feedparser.parse(content, response_headers=headers)
+    
+    entries = []
+    for entry in feed.entries[:limit]:
+        published_parsed = entry.get('published_parsed')
+        entries.append({
+            'title': entry.get('title', ''),
+            'link': entry.get('link', ''),
+            'summary': entry.get('summary', ''),
+            'summary_is_html': entry.get('summary_detail', {}).get('type', 'text/html') == 'text/html',
+            'published_parsed': tuple(published_parsed[:6]) if published_parsed else None
+        })
+    
+    return feed.feed.get('title', 'RSS Feed'), entries
+
 class RSSSource:
     """Fetches articles from RSS feeds"""
     
-    def __init__(self, urls: List[str], items_per_feed: int = 5):
+    def __init__(self, session: aiohttp.ClientSession, urls: List[str], items_per_feed: int = 5,
+                 max_concurrency: int = 10, executor: Optional[Executor] = None,
+                 cache: Optional[HTTPCache] = None):
+        self.session = session
+        self.cache = cache or HTTPCache()
         self.urls = urls
         self.items_per_feed = items_per_feed
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+    
+    async def _fetch_feed(self, url: str, semaphore: asyncio.Semaphore) -> List[NewsItem]:
+        """Download a feed on the event loop and parse it in the executor.
+        
+        Unchanged feeds come back as 304s and reuse the cached parse.
+        """
+        try:
+            logger.info(f"Fetching RSS feed: {url}")
+            
+            async def parse(content: bytes, headers: Mapping[str, str]) -> Tuple[str, List[Dict]]:
+                parse_headers = {
+                    'content-type': headers.get('Content-Type', ''),
+                    'content-location': url
+                }
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self.executor, _parse_feed, content, parse_headers, self.items_per_feed
+                )
+            
+            async with semaphore:
+                feed_title, entries = await self.cache.get(self.session, url, parse=parse, namespace='rss')
+            
+            items = []
+            for entry in entries:
+                # feedparser normalizes dates to UTC struct_time
+                published_ts = None
+                if entry['published_parsed']:
+                    try:
+                        published_ts = calendar.timegm(entry['published_parsed'])
+                    except (TypeError, ValueError):
+                        pass
+                
+                item = NewsItem(
+                    title=entry['title'],
+                    url=entry['link'],
+                    summary=entry['summary'],
+                    summary_is_html=entry.get('summary_is_html', True),
+                    source=f"{feed_title} (RSS)",
+                    published_ts=published_ts,
+                    score=0
+                )
+                items.append(item)
+            
+            logger.info(f"Fetched {len(items)} items from {feed_title}")
+            return items
+            
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"RSS feed error for {url}: {e.status}")
+            return []
+        except Exception as e:
+            logger.error(f"Error fetching RSS feed {url}: {e}")
+            return []
     
     async def fetch(self) -> List[NewsItem]:
         """Fetch articles from RSS feeds"""
-        items = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(self._fetch_feed(url, semaphore) for url in self.urls))
         
-        for url in self.urls:
-            try:
-                logger.info(f"Fetching RSS feed: {url}")
-                feed = feedparser.parse(url)
-                
-                feed_title = feed.feed.get('title', 'RSS Feed')
-                
-                for entry in feed.entries[:self.items_per_feed]:
-                    # Parse published date
-                    published_at = None
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        try:
-                            published_at = datetime(*entry.published_parsed[:6])
-                        except:
-                            pass
-                    
-                    item = NewsItem(
-                        title=entry.title,
-                        url=entry.link,
-                        summary=entry.get('summary', ''),
-                        source=f"{feed_title} (RSS)",
-                        published_at=published_at,
-                        score=0
-                    )
-                    items.append(item)
-                
-                logger.info(f"Fetched {len(feed.entries[:self.items_per_feed])} items from {feed_title}")
-                
-            except Exception as e:
-                logger.error(f"Error fetching RSS feed {url}: {e}")
-                continue
+        items = [item for feed_items in results for item in feed_items]
         
         logger.info(f"Total RSS items fetched: {len(items)}")
-        return items
\ No newline at end of file
+        return items
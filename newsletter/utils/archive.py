@@ -0,0 +1,152 @@
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from ..models import NewsItem
+from .sanitize import html_to_text
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS editions (
+    id INTEGER PRIMARY KEY,
+    created_at INTEGER NOT NULL,
+    filename TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    edition_id INTEGER NOT NULL REFERENCES editions(id),
+    rank INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    published_ts INTEGER,
+    score INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_edition ON items(edition_id);
+CREATE INDEX IF NOT EXISTS items_source ON items(source);
+CREATE INDEX IF NOT EXISTS editions_created ON editions(created_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, summary, source, content='items', content_rowid='id'
+);
+"""
+
+@dataclass
+class ArchivedItem:
+    """An item as it appeared in a past edition"""
+    edition_id: int
+    edition_at: datetime
+    rank: int
+    title: str
+    url: str
+    summary: str
+    source: str
+    category: str
+    published_at: Optional[datetime]
+    score: int
+
+class NewsletterArchive:
+    """Local SQLite archive of every edition's items with full-text search.
+    
+    Items are stored per edition with their rank, score and metadata, and
+    an FTS5 index over title, summary and source answers keyword queries
+    without scanning old editions. This uses the sqlite3 module directly
+    because FTS5 is SQLite-specific.
+    """
+    
+    def __init__(self, path: str = "newsletter_archive.db"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+    
+    def record_edition(self, items: List[NewsItem], filename: Optional[str] = None) -> int:
+        """Store one edition's ranked items and return its ID"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO editions (created_at, filename) VALUES (?, ?)",
+                (int(time.time()), filename)
+            )
+            edition_id = cursor.lastrowid
+            
+            for rank, item in enumerate(items, 1):
+                # Markup would make tag names like "p" or "href" match most items;
+                # the FTS index reads its content from items, so both get the text
+                summary = html_to_text(item.summary) if item.summary_is_html else item.summary
+                cursor = self.conn.execute(
+                    "INSERT INTO items (edition_id, rank, title, url, summary, source, category, published_ts, score) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (edition_id, rank, item.title, item.url, summary, item.source,
+                     item.category, item.published_ts, item.score)
+                )
+                self.conn.execute(
+                    "INSERT INTO items_fts (rowid, title, summary, source) VALUES (?, ?, ?, ?)",
+                    (cursor.lastrowid, item.title, summary, item.source)
+                )
+        
+        logger.info(f"Archived {len(items)} items as edition {edition_id}")
+        return edition_id
+    
+    def search(self, query: Optional[str] = None, source: Optional[str] = None,
+               since: Optional[datetime] = None, until: Optional[datetime] = None,
+               limit: int = 50) -> List[ArchivedItem]:
+        """Search past editions.
+        
+        ``query`` words must all appear in an item's title, summary or
+        source, and results are ordered by relevance. ``source`` matches
+        source names by prefix (``"Reddit"`` covers every subreddit).
+        ``since``/``until`` bound the edition date. Without a query, the
+        newest editions come first.
+        """
+        clauses = []
+        params = []
+        joins = "JOIN editions ON editions.id = items.edition_id"
+        order = "editions.created_at DESC, items.rank"
+        
+        if query:
+            # Quote each word so FTS5 operators in user input are taken literally
+            terms = " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+            joins += " JOIN items_fts ON items_fts.rowid = items.id"
+            clauses.append("items_fts MATCH ?")
+            params.append(terms)
+            order = "items_fts.rank"
+        if source:
+            clauses.append("items.source LIKE ? ESCAPE '\\'")
+            params.append(source.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        if since:
+            clauses.append("editions.created_at >= ?")
+            params.append(int(since.timestamp()))
+        if until:
+            clauses.append("editions.created_at < ?")
+            params.append(int(until.timestamp()))
+        
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT items.edition_id, editions.created_at, items.rank, items.title, items.url, "
+            f"items.summary, items.source, items.category, items.published_ts, items.score "
+            f"FROM items {joins} {where} ORDER BY {order} LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        
+        return [
+            ArchivedItem(
+                edition_id=row[0],
+                edition_at=datetime.fromtimestamp(row[1], timezone.utc),
+                rank=row[2],
+                title=row[3],
+                url=row[4],
+                summary=row[5],
+                source=row[6],
+                category=row[7],
+                published_at=datetime.fromtimestamp(row[8], timezone.utc) if row[8] is not None else None,
+                score=row[9]
+            )
+            for row in rows
+        ]
+    
+    def close(self):
+        self.conn.close()
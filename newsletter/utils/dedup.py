@@ -0,0 +1,249 @@
+import hashlib
+import random
+import re
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+from ..models import NewsItem
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ref_src', 'ref_url', 'cmpid', 'smid', 'smtyp', 'sr_share', 'amp'
+}
+
+# Host prefixes for mobile/AMP mirrors of the same page
+MIRROR_HOST_PREFIXES = ('www.', 'm.', 'mobile.', 'amp.')
+
+# Words too common to say anything about which story an item covers
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in',
+    'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'were',
+    'will', 'with', 'after', 'over', 'new', 'says', 'about', 'into', 'than', 'but'
+}
+
+# Summary words considered for near-duplicate detection; the lede carries the story
+SUMMARY_WORDS = 40
+
+TOKEN_RE = re.compile(r"\w+")
+TAG_RE = re.compile(r"<[^>]+>")
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith('utm_') or name in TRACKING_PARAMS
+
+def _is_route_fragment(fragment: str) -> bool:
+    return fragment.startswith('!') or '/' in fragment
+
+def canonicalize_url(url: str) -> str:
+    """Reduce a URL to a key shared by every variant of the same page.
+    
+    Scheme, ``www.``/mobile/AMP host prefixes, default ports, in-page
+    fragments, trailing slashes, AMP path suffixes and tracking parameters
+    are dropped and the remaining query is sorted. Route-style fragments
+    (``#/…``, ``#!…`` or any containing ``/``) name a different view of a
+    single-page app, such as one Gmail message, so they are kept. AMP cache URLs (Google and
+    ampproject.org) resolve to the page they wrap. The result is only a
+    comparison key, not a fetchable URL.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    path = parts.path
+    
+    # Google AMP viewer and AMP cache wrap the origin URL in the path:
+    # google.com/amp/s/example.com/a, example-com.cdn.ampproject.org/c/s/example.com/a
+    is_google_amp = host in ('google.com', 'www.google.com') and path.startswith('/amp/')
+    if is_google_amp or host.endswith('.cdn.ampproject.org'):
+        segments = path.lstrip('/').split('/')
+        if is_google_amp:
+            segments = segments[1:]
+        if segments and segments[0] in ('c', 'v', 'i'):
+            segments = segments[1:]
+        if segments and segments[0] == 's':
+            segments = segments[1:]
+        if segments:
+            inner = '/'.join(segments)
+            if parts.query:
+                inner = f"{inner}?{parts.query}"
+            return canonicalize_url(f"https://{unquote(inner)}")
+    
+    for prefix in MIRROR_HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    
+    path = path.rstrip('/')
+    if path.endswith('/amp'):
+        path = path[:-len('/amp')]
+    elif path.endswith('.amp'):
+        path = path[:-len('.amp')]
+    elif path.endswith('.amp.html'):
+        path = path[:-len('.amp.html')] + '.html'
+    
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not _is_tracking_param(name) and not (name == 'outputType' and value == 'amp')]
+    query.sort()
+    
+    key = f"{host}{path}"
+    if query:
+        key = f"{key}?{urlencode(query)}"
+    if _is_route_fragment(parts.fragment):
+        key = f"{key}#{parts.fragment}"
+    return key
+
+def item_fingerprint(item: NewsItem) -> int:
+    """Stable signed 64-bit ID for an item, derived from its canonical URL"""
+    key = canonicalize_url(item.url) if item.url else item.title
+    digest = hashlib.sha1(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big', signed=True)
+
+class Deduplicator:
+    """Collapses items that point at the same page into one.
+    
+    Items are indexed by canonical URL in a dict, so each lookup is O(1).
+    A duplicate is folded into the first item seen for its URL, which
+    keeps the best score, the best rank score and the earliest publish
+    time of the two, and lists the duplicate among its related items.
+    """
+    
+    def __init__(self):
+        self._items: Dict[str, NewsItem] = {}
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def add(self, item: NewsItem) -> Tuple[NewsItem, bool]:
+        """Return the surviving item and whether this URL was new"""
+        if not item.url:
+            return item, True
+        
+        key = canonicalize_url(item.url)
+        existing = self._items.get(key)
+        if existing is None:
+            self._items[key] = item
+            return item, True
+        
+        merge_items(existing, item)
+        return existing, False
+
+def merge_items(target: NewsItem, other: NewsItem):
+    """Fold a duplicate into target, keeping the best scores and earliest date.
+    
+    The duplicate is listed in target's ``related`` items so its source
+    stays credited, unless it is the same page from the same source.
+    """
+    if other is not target and not any(related is other for related in target.related) and not (
+        other.source == target.source and canonicalize_url(other.url) == canonicalize_url(target.url)
+    ):
+        target.related.append(other)
+    if other.score > target.score:
+        target.score = other.score
+    # Rank scores are normalized per source, so the best one is kept as is
+    if other.rank_score is not None and (target.rank_score is None or other.rank_score > target.rank_score):
+        target.rank_score = other.rank_score
+    if other.published_ts is not None and (
+        target.published_ts is None or other.published_ts < target.published_ts
+    ):
+        target.published_ts = other.published_ts
+
+def _content_words(item: NewsItem) -> Tuple[List[str], bool]:
+    """Content words of an item's title and the start of its summary, and whether it had a summary"""
+    summary_words = TOKEN_RE.findall(TAG_RE.sub(' ', item.summary.lower()))[:SUMMARY_WORDS]
+    words = TOKEN_RE.findall(item.title.lower()) + summary_words
+    return [word for word in words if word not in STOPWORDS], bool(summary_words)
+
+def _shingles(words: List[str]) -> FrozenSet[int]:
+    """Hashed word bigrams.
+    
+    Pairs keep word order, so headlines that share most of their words but
+    differ in the one that matters ("rises" and "falls", "1.80" and
+    "1.81") share few shingles.
+    """
+    return frozenset(hash(pair) & 0xFFFFFFFFFFFFFFFF for pair in zip(words, words[1:]))
+
+class NearDuplicateClusterer:
+    """Groups items covering the same story under one representative.
+    
+    Each item's word bigrams (shingles) get a MinHash signature, and the
+    signature is split into bands that index hash buckets
+    (locality-sensitive hashing). Only items sharing a bucket are compared,
+    so clustering stays close to linear in the number of items instead of
+    comparing every pair. A candidate joins a cluster when the Jaccard
+    similarity of its shingles and the representative's reaches
+    ``threshold``.
+    
+    Short texts share too much by chance, so items with fewer than
+    ``min_words`` content words, or ``min_title_words`` when they have no
+    summary, are never clustered.
+    
+    The first item of a cluster represents it. Later members are listed in
+    its ``related`` items and merged into it like exact duplicates (best
+    score and rank score, earliest publish time).
+    """
+    
+    def __init__(self, threshold: float = 0.75, bands: int = 16, rows: int = 2, min_words: int = 4,
+                 min_title_words: int = 6, seed: int = 1):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.min_words = min_words
+        self.min_title_words = min_title_words
+        
+        # XOR with a random mask permutes the hash space; one mask per row
+        rng = random.Random(seed)
+        self._masks = [rng.getrandbits(64) for _ in range(bands * rows)]
+        self._buckets: List[Dict[Tuple[int, ...], Tuple[NewsItem, FrozenSet[int]]]] = [{} for _ in range(bands)]
+        self._representative: Dict[int, NewsItem] = {}
+        self.clusters = 0
+    
+    def _signature(self, shingles: FrozenSet[int]) -> List[int]:
+        return [min(map(mask.__xor__, shingles)) for mask in self._masks]
+    
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, ...]]:
+        return [tuple(signature[start:start + self.rows]) for start in range(0, len(signature), self.rows)]
+    
+    def _find(self, shingles: FrozenSet[int], band_keys: List[Tuple[int, ...]]) -> Optional[NewsItem]:
+        checked = set()
+        for buckets, band_key in zip(self._buckets, band_keys):
+            match = buckets.get(band_key)
+            if match is None or id(match[0]) in checked:
+                continue
+            representative, other_shingles = match
+            checked.add(id(representative))
+            
+            # Banding only proposes candidates; confirm with the exact Jaccard index
+            if len(shingles & other_shingles) / len(shingles | other_shingles) >= self.threshold:
+                return representative
+        return None
+    
+    def add(self, item: NewsItem) -> NewsItem:
+        """Cluster an item and return its cluster's representative"""
+        representative = self._representative.get(id(item))
+        if representative is not None:
+            # An item already clustered was updated by an exact-duplicate merge
+            if representative is not item:
+                merge_items(representative, item)
+            return representative
+        
+        words, has_summary = _content_words(item)
+        if len(words) < (self.min_words if has_summary else self.min_title_words):
+            self._representative[id(item)] = item
+            self.clusters += 1
+            return item
+        
+        shingles = _shingles(words)
+        band_keys = self._band_keys(self._signature(shingles))
+        representative = self._find(shingles, band_keys)
+        if representative is None:
+            representative = item
+            self.clusters += 1
+            for buckets, band_key in zip(self._buckets, band_keys):
+                buckets.setdefault(band_key, (item, shingles))
+        else:
+            merge_items(representative, item)
+        
+        self._representative[id(item)] = representative
+        return representative
@@ -0,0 +1,133 @@
+import hashlib
+import logging
+import os
+import pickle
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class DiskCache:
+    """Persistent response cache with per-namespace TTLs and LRU size eviction.
+    
+    Each value is pickled to its own file under ``directory``. The files
+    are tracked in least-recently-used order, and the oldest are deleted
+    whenever the total size exceeds ``max_bytes``. A namespace groups the
+    keys of one source (``hackernews``, ``rss``, ...) and selects its TTL.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int = 100 * 1024 * 1024,
+                 default_ttl: float = 900, ttls: Optional[Dict[str, float]] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        
+        self.hits = Counter()
+        self.misses = Counter()
+        self.evictions = 0
+        
+        # filename -> size, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+    
+    def _load_index(self):
+        """Rebuild the LRU index from the files left by earlier runs"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pkl'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name, stat.st_size))
+        
+        for _, name, size in sorted(entries):
+            self._index[name] = size
+            self._total_bytes += size
+    
+    def _filename(self, namespace: str, key: str) -> str:
+        digest = hashlib.sha1(f"{namespace}\0{key}".encode('utf-8')).hexdigest()
+        return f"{digest}.pkl"
+    
+    def ttl_for(self, namespace: str) -> float:
+        return self.ttls.get(namespace, self.default_ttl)
+    
+    def is_fresh(self, namespace: str, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_for(namespace)
+    
+    def get(self, namespace: str, key: str) -> Any:
+        """Return the stored value, or None if absent.
+        
+        Expiry is left to the caller (see is_fresh), so a stale value can
+        still supply validators for a conditional request.
+        """
+        name = self._filename(namespace, key)
+        if name not in self._index:
+            return None
+        
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.warning(f"Dropping unreadable cache entry {name}: {e}")
+            self._remove(name)
+            return None
+        
+        self._index.move_to_end(name)
+        return value
+    
+    def set(self, namespace: str, key: str, value: Any):
+        """Store a value, evicting least recently used entries if needed"""
+        name = self._filename(namespace, key)
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.tmp"
+        
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except (OSError, pickle.PicklingError) as e:
+            logger.warning(f"Could not write cache entry for {key}: {e}")
+            return
+        
+        self._total_bytes += size - self._index.pop(name, 0)
+        self._index[name] = size
+        self._evict()
+    
+    def record_hit(self, namespace: str):
+        self.hits[namespace] += 1
+    
+    def record_miss(self, namespace: str):
+        self.misses[namespace] += 1
+    
+    def _remove(self, name: str):
+        self._total_bytes -= self._index.pop(name, 0)
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except OSError:
+            pass
+    
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            name = next(iter(self._index))
+            self._remove(name)
+            self.evictions += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per namespace plus overall size and evictions"""
+        return {
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "bytes": self._total_bytes
+        }
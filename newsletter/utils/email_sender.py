@@ -0,0 +1,390 @@
+import asyncio
+import base64
+import copy
+import logging
+import socket
+import ssl
+import time
+from dataclasses import dataclass, field
+from email.message import EmailMessage
+from email.policy import SMTP as SMTP_POLICY
+from email.utils import getaddresses, make_msgid
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SMTPError(Exception):
+    """A reply from the server that ended a transaction"""
+    
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+    
+    @property
+    def is_temporary(self) -> bool:
+        return 400 <= self.code < 500
+
+def build_message(sender: str, recipient: str, subject: str, text: str, html: Optional[str] = None) -> EmailMessage:
+    """Create a plain-text email, with an HTML alternative when given"""
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = recipient
+    message["Subject"] = subject
+    message["Message-ID"] = make_msgid(domain=sender.rpartition("@")[2] or None)
+    message.set_content(text)
+    if html is not None:
+        message.add_alternative(html, subtype="html")
+    return message
+
+@lru_cache(maxsize=None)
+def _local_hostname() -> str:
+    # getfqdn() can wait on DNS, so it is resolved once per process
+    return socket.getfqdn()
+
+def _dot_stuff(data: bytes) -> bytes:
+    """Escape leading dots and terminate the DATA section"""
+    if data.startswith(b"."):
+        data = b"." + data
+    data = data.replace(b"\r\n.", b"\r\n..")
+    if not data.endswith(b"\r\n"):
+        data += b"\r\n"
+    return data + b".\r\n"
+
+class SMTPConnection:
+    """One persistent SMTP session on asyncio streams.
+    
+    After EHLO, and STARTTLS and AUTH PLAIN when configured, the session
+    carries any number of transactions. When the server advertises
+    PIPELINING, a transaction's MAIL, RCPT and DATA commands go out in one
+    write and their replies are read back together, so a message costs
+    two round trips instead of three plus one per recipient.
+    """
+    
+    def __init__(self, host: str, port: int, username: Optional[str] = None, password: Optional[str] = None,
+                 starttls: bool = True, use_tls: bool = False, timeout: float = 30,
+                 ssl_context: Optional[ssl.SSLContext] = None):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.extensions: Dict[str, str] = {}
+        self.messages_sent = 0
+        # Monotonic time of the last exchange with the server
+        self.last_used = time.monotonic()
+    
+    @property
+    def pipelining(self) -> bool:
+        return "pipelining" in self.extensions
+    
+    async def connect(self):
+        context = self.ssl_context or ssl.create_default_context()
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=context if self.use_tls else None),
+            self.timeout
+        )
+        code, message = await self._read_reply()
+        if code != 220:
+            raise SMTPError(code, message)
+        
+        await self._ehlo()
+        if self.starttls and not self.use_tls:
+            if "starttls" not in self.extensions:
+                raise SMTPError(502, f"{self.host} does not support STARTTLS")
+            await self._command("STARTTLS", 220)
+            await self.writer.start_tls(context, server_hostname=self.host)
+            await self._ehlo()
+        
+        if self.username:
+            credentials = base64.b64encode(f"\0{self.username}\0{self.password or ''}".encode()).decode()
+            await self._command(f"AUTH PLAIN {credentials}", 235)
+        self.last_used = time.monotonic()
+    
+    async def _ehlo(self):
+        code, message = await self._command(f"EHLO {_local_hostname()}")
+        if code != 250:
+            raise SMTPError(code, message)
+        
+        self.extensions = {}
+        for line in message.splitlines()[1:]:
+            keyword, _, params = line.partition(" ")
+            self.extensions[keyword.lower()] = params
+    
+    async def _read_reply(self) -> Tuple[int, str]:
+        """Read one possibly multi-line reply"""
+        lines = []
+        while True:
+            line = await asyncio.wait_for(self.reader.readline(), self.timeout)
+            if not line:
+                raise ConnectionError(f"{self.host} closed the connection")
+            line = line.decode("utf-8", "replace").rstrip("\r\n")
+            lines.append(line[4:])
+            if line[3:4] != "-":
+                return int(line[:3]), "\n".join(lines)
+    
+    async def _command(self, command: str, expected: Optional[int] = None) -> Tuple[int, str]:
+        self.writer.write(command.encode() + b"\r\n")
+        await self.writer.drain()
+        code, message = await self._read_reply()
+        if expected is not None and code != expected:
+            raise SMTPError(code, message)
+        return code, message
+    
+    async def send(self, sender: str, recipients: Sequence[str], data: bytes) -> Dict[str, SMTPError]:
+        """Run one transaction and return the recipients the server refused.
+        
+        Raises SMTPError when the message was not accepted for anyone; the
+        session is reset and stays usable.
+        """
+        commands = [f"MAIL FROM:<{sender}>"] + [f"RCPT TO:<{recipient}>" for recipient in recipients] + ["DATA"]
+        
+        if self.pipelining:
+            self.writer.write("".join(f"{command}\r\n" for command in commands).encode())
+            await self.writer.drain()
+            replies = [await self._read_reply() for _ in commands]
+        else:
+            # Without pipelining, stop as soon as the transaction cannot succeed
+            replies = [await self._command(commands[0])]
+            if replies[0][0] == 250:
+                for command in commands[1:-1]:
+                    replies.append(await self._command(command))
+                if any(code in (250, 251) for code, _ in replies[1:]):
+                    replies.append(await self._command("DATA"))
+            replies += [(503, "Transaction aborted")] * (len(commands) - len(replies))
+        
+        mail_code, mail_message = replies[0]
+        refused = {
+            recipient: SMTPError(code, message)
+            for recipient, (code, message) in zip(recipients, replies[1:-1])
+            if code not in (250, 251)
+        }
+        data_code, data_message = replies[-1]
+        
+        if data_code == 354 and (mail_code != 250 or len(refused) == len(recipients)):
+            # A pipelined DATA can be accepted after the envelope failed;
+            # end it empty so the session is reset below
+            self.writer.write(b".\r\n")
+            await self.writer.drain()
+            await self._read_reply()
+            data_code = 503
+        
+        if data_code != 354:
+            await self._command("RSET")
+            if mail_code != 250:
+                raise SMTPError(mail_code, mail_message)
+            if refused and len(refused) == len(recipients):
+                raise next(iter(refused.values()))
+            raise SMTPError(data_code, data_message)
+        
+        self.writer.write(_dot_stuff(data))
+        await self.writer.drain()
+        code, message = await self._read_reply()
+        if code != 250:
+            raise SMTPError(code, message)
+        
+        self.messages_sent += 1
+        self.last_used = time.monotonic()
+        return refused
+    
+    async def close(self):
+        if self.writer is None:
+            return
+        try:
+            self.writer.write(b"QUIT\r\n")
+            await self.writer.drain()
+            await asyncio.wait_for(self.reader.readline(), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            pass
+        finally:
+            self.writer.close()
+            self.writer = None
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` sends per second with bursts of ``burst``"""
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+@dataclass
+class SendStats:
+    """Outcome of a delivery run"""
+    sent: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    failures: List[Tuple[str, str]] = field(default_factory=list)
+    
+    @property
+    def throughput(self) -> float:
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+class AsyncEmailSender:
+    """Delivers email over a pool of persistent SMTP connections.
+    
+    Up to ``pool_size`` connections are opened on demand and reused, each
+    for at most ``max_messages_per_connection`` messages before it is
+    replaced. Sends are spread over the pool concurrently and, with
+    ``rate_limit``, held to that many messages per second overall.
+    
+    Servers close sessions that sit idle, so pooled connections unused for
+    ``idle_timeout`` seconds are closed instead of reused. A send that
+    finds its connection dropped, or gets 421 (the server is closing the
+    session), is retried once on a newly opened connection. Other SMTP
+    errors are recorded as failures without stopping the run.
+    """
+    
+    def __init__(self, host: str, port: int = 587, username: Optional[str] = None,
+                 password: Optional[str] = None, starttls: bool = True, use_tls: bool = False,
+                 pool_size: int = 5, rate_limit: Optional[float] = None,
+                 max_messages_per_connection: int = 100, timeout: float = 30,
+                 idle_timeout: float = 60, ssl_context: Optional[ssl.SSLContext] = None):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.use_tls = use_tls
+        self.pool_size = pool_size
+        self.max_messages_per_connection = max_messages_per_connection
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context
+        self.rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+        self._idle: List[SMTPConnection] = []
+        self._slots = asyncio.Semaphore(pool_size)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+    
+    async def _acquire(self, fresh: bool = False) -> SMTPConnection:
+        """A pooled connection, or a newly opened one when ``fresh`` or none is usable"""
+        await self._slots.acquire()
+        while self._idle and not fresh:
+            connection = self._idle.pop()
+            if time.monotonic() - connection.last_used < self.idle_timeout:
+                return connection
+            # The server has likely dropped it already
+            await connection.close()
+        
+        connection = SMTPConnection(
+            self.host, self.port, self.username, self.password,
+            starttls=self.starttls, use_tls=self.use_tls, timeout=self.timeout,
+            ssl_context=self.ssl_context
+        )
+        try:
+            await connection.connect()
+        except BaseException:
+            await connection.close()
+            self._slots.release()
+            raise
+        return connection
+    
+    async def _release(self, connection: SMTPConnection, reusable: bool):
+        if reusable and connection.messages_sent < self.max_messages_per_connection:
+            self._idle.append(connection)
+        else:
+            await connection.close()
+        self._slots.release()
+    
+    async def send_message(self, message: EmailMessage, sender: Optional[str] = None,
+                           recipients: Optional[Sequence[str]] = None) -> Dict[str, SMTPError]:
+        """Send one message, returning any recipients the server refused.
+        
+        The envelope defaults to the From, To, Cc and Bcc headers; Bcc is
+        never transmitted.
+        """
+        if sender is None:
+            sender = getaddresses([message["Sender"] or message["From"]])[0][1]
+        if recipients is None:
+            headers = message.get_all("To", []) + message.get_all("Cc", []) + message.get_all("Bcc", [])
+            recipients = [address for _, address in getaddresses(headers) if address]
+        if "Bcc" in message:
+            message = copy.copy(message)
+            del message["Bcc"]
+        data = message.as_bytes(policy=SMTP_POLICY)
+        
+        if self.rate_limiter:
+            await self.rate_limiter.acquire()
+        
+        for attempt in (1, 2):
+            # A retry never takes another pooled connection, which may be
+            # just as stale as the one that failed
+            connection = await self._acquire(fresh=attempt == 2)
+            try:
+                refused = await connection.send(sender, recipients, data)
+            except SMTPError as e:
+                # 421 means the server is closing the session
+                await self._release(connection, e.code != 421)
+                if e.code != 421 or attempt == 2:
+                    raise
+                logger.warning(f"SMTP server {self.host} closed the session ({e}), retrying")
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                await self._release(connection, False)
+                if attempt == 2:
+                    raise
+                logger.warning(f"SMTP connection to {self.host} lost ({e}), retrying")
+            except BaseException:
+                await self._release(connection, False)
+                raise
+            else:
+                await self._release(connection, True)
+                return refused
+    
+    async def send_many(self, messages: Iterable[EmailMessage]) -> SendStats:
+        """Send messages through the whole pool and report the outcome.
+        
+        Messages are pulled lazily, so a generator of tens of thousands of
+        digests is never materialized at once.
+        """
+        stats = SendStats()
+        start = time.perf_counter()
+        pending = iter(messages)
+        
+        async def worker():
+            for message in pending:
+                try:
+                    refused = await self.send_message(message)
+                except (SMTPError, OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                    stats.failed += 1
+                    stats.failures.append((message["To"] or "", str(e)))
+                    continue
+                stats.sent += 1
+                for recipient, error in refused.items():
+                    stats.failures.append((recipient, str(error)))
+        
+        await asyncio.gather(*(worker() for _ in range(self.pool_size)))
+        stats.elapsed = time.perf_counter() - start
+        
+        logger.info(
+            f"Sent {stats.sent} messages in {stats.elapsed:.1f}s ({stats.throughput:.1f}/s), "
+            f"{stats.failed} failed"
+        )
+        return stats
+    
+    async def close(self):
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(connection.close() for connection in idle))
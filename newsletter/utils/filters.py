@@ -0,0 +1,138 @@
+import heapq
+import itertools
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+def _trie_pattern(node: Dict) -> str:
+    """Regex for the keywords below a trie node.
+    
+    A node that completes a keyword ends the pattern: only whether some
+    keyword occurs matters, so longer keywords sharing that prefix are moot.
+    """
+    if "" in node:
+        return ""
+    
+    single_chars = []
+    branches = []
+    for char in sorted(node):
+        rest = _trie_pattern(node[char])
+        if rest:
+            branches.append(re.escape(char) + rest)
+        else:
+            single_chars.append(re.escape(char))
+    
+    if len(single_chars) == 1:
+        branches.append(single_chars[0])
+    elif single_chars:
+        branches.append("[" + "".join(single_chars) + "]")
+    
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+def _keywords_pattern(keywords: Sequence[str]) -> Optional[str]:
+    """Trie-shaped alternation so the regex engine walks shared prefixes once"""
+    trie: Dict = {}
+    for keyword in keywords:
+        keyword = keyword.lower()
+        if not keyword:
+            continue
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    if not trie:
+        return None
+    return _trie_pattern(trie)
+
+class KeywordMatcher:
+    """Include/exclude keyword filter compiled into trie-shaped regexes.
+    
+    Each keyword list becomes one pattern that walks shared prefixes once,
+    and the text is lowercased once per item, so the cost no longer grows
+    with the number of keywords times the text length. Matching keeps
+    substring semantics: a keyword matches anywhere inside a word. An empty
+    keyword matches nothing, where a plain ``"" in text`` test would match
+    every text, so ``""`` in either list is ignored.
+    
+    Exclude and include are separate case-sensitive patterns over the
+    lowercased text. That lets the regex engine skip ahead to positions
+    whose first character can start a keyword, which a single combined or
+    IGNORECASE pattern cannot do.
+    """
+    
+    def __init__(self, include_keywords: Sequence[str], exclude_keywords: Sequence[str]):
+        include = _keywords_pattern(include_keywords)
+        exclude = _keywords_pattern(exclude_keywords)
+        self._include = re.compile(include) if include is not None else None
+        self._exclude = re.compile(exclude) if exclude is not None else None
+    
+    @classmethod
+    @lru_cache(maxsize=32)
+    def compile(cls, include_keywords: Tuple[str, ...], exclude_keywords: Tuple[str, ...]) -> "KeywordMatcher":
+        """Shared matcher for a pair of keyword lists"""
+        return cls(include_keywords, exclude_keywords)
+    
+    def matches(self, text: str) -> bool:
+        """True if text has an include keyword (when any are set) and no exclude keyword"""
+        if self._include is None and self._exclude is None:
+            return True
+        
+        text = text.lower()
+        if self._exclude is not None and self._exclude.search(text):
+            return False
+        return self._include is None or self._include.search(text) is not None
+
+class TopKRanker:
+    """Streaming top-K selection over items as they arrive.
+    
+    Only the k best items seen so far are kept, in a min-heap whose root is
+    the weakest survivor, so memory stays O(k) and each push costs O(log k).
+    Ties keep the item that arrived first, matching a stable descending sort.
+    Pushing an item that is already held re-ranks it in place, which is how
+    merged duplicates pick up their improved score.
+    """
+    
+    def __init__(self, k: int, key: Callable[[Any], Any]):
+        self.k = k
+        self.key = key
+        self._heap: List[List[Any]] = []
+        self._members: Dict[int, List[Any]] = {}
+        self._counter = itertools.count()
+    
+    def push(self, item: Any, key: Any = None):
+        """Offer an item, ranked by ``key`` when given and ``self.key(item)`` otherwise"""
+        if self.k <= 0:
+            return
+        if key is None:
+            key = self.key(item)
+        
+        held = self._members.get(id(item))
+        if held is not None:
+            held[0] = key
+            heapq.heapify(self._heap)
+            return
+        
+        # Negated arrival order makes later items lose ties
+        entry = [key, -next(self._counter), item]
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            evicted = heapq.heapreplace(self._heap, entry)
+            del self._members[id(evicted[2])]
+        else:
+            return
+        self._members[id(item)] = entry
+    
+    def extend(self, items: Iterable[Any]):
+        for item in items:
+            self.push(item)
+    
+    def __len__(self) -> int:
+        return len(self._heap)
+    
+    def results(self) -> List[Any]:
+        """Items in descending rank order"""
+        return [item for _, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
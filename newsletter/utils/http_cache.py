@@ -0,0 +1,121 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Mapping, Optional
+
+import aiohttp
+
+from .disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+# Turns a response body and its headers into the value the cache stores
+Parser = Callable[[bytes, Mapping[str, str]], Awaitable[Any]]
+
+async def parse_json(content: bytes, headers: Mapping[str, str]) -> Any:
+    """Default parser for JSON APIs"""
+    return json.loads(content)
+
+@dataclass
+class CacheEntry:
+    """Validators and parsed value from the last successful response"""
+    value: Any
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = 0.0
+
+class HTTPCache:
+    """Conditional-GET cache sitting under the agent's aiohttp session.
+    
+    Responses carrying an ETag or Last-Modified header are remembered along
+    with their parsed value. Later requests for the same URL send
+    If-None-Match / If-Modified-Since, and a 304 reply returns the stored
+    value without downloading or parsing the body again.
+    
+    With a DiskCache store, entries persist across restarts and anything
+    younger than its namespace's TTL is served without touching the network.
+    Without one, entries live in memory and are always revalidated; the
+    ``max_entries`` most recently used are kept, so a long-lived agent
+    does not accumulate every URL it has ever fetched.
+    """
+    
+    def __init__(self, store: Optional[DiskCache] = None, max_entries: int = 2048):
+        self.store = store
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.revalidated = 0
+        self.downloaded = 0
+    
+    def _load(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        if self.store:
+            return self.store.get(namespace, key)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+    
+    def _save(self, namespace: str, key: str, entry: CacheEntry):
+        if self.store:
+            self.store.set(namespace, key, entry)
+        else:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    @staticmethod
+    def _key(url: str, params: Optional[Mapping[str, Any]]) -> str:
+        if not params:
+            return url
+        query = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        return f"{url}?{query}"
+    
+    async def get(self, session: aiohttp.ClientSession, url: str,
+                  params: Optional[Mapping[str, Any]] = None, parse: Parser = parse_json,
+                  namespace: str = "default") -> Any:
+        """GET a URL and return its parsed body, revalidating any cached copy.
+        
+        Raises aiohttp.ClientResponseError for any status other than 200/304.
+        """
+        key = self._key(url, params)
+        entry = self._load(namespace, key)
+        
+        if self.store:
+            if entry and self.store.is_fresh(namespace, entry.stored_at):
+                self.store.record_hit(namespace)
+                return entry.value
+            self.store.record_miss(namespace)
+        
+        headers = {}
+        if entry:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        
+        async with session.get(url, params=params, headers=headers) as response:
+            if response.status == 304 and entry:
+                self.revalidated += 1
+                logger.debug(f"Not modified: {url}")
+                entry.stored_at = time.time()
+                self._save(namespace, key, entry)
+                return entry.value
+            
+            response.raise_for_status()
+            content = await response.read()
+            response_headers = response.headers
+        
+        self.downloaded += 1
+        value = await parse(content, response_headers)
+        
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        # The disk store also keeps unvalidated responses for their TTL
+        if etag or last_modified or self.store:
+            self._save(namespace, key, CacheEntry(value, etag, last_modified, time.time()))
+        else:
+            self._entries.pop(key, None)
+        
+        return value
@@ -0,0 +1,106 @@
+from html import escape
+from html.parser import HTMLParser
+from typing import List
+from urllib.parse import urlsplit
+
+# Tags kept in HTML summaries; anything else is dropped and its text kept
+ALLOWED_TAGS = {
+    'a', 'b', 'blockquote', 'br', 'code', 'em', 'i', 'li', 'ol', 'p', 'pre', 'strong', 'ul'
+}
+
+# Attributes kept per tag
+ALLOWED_ATTRIBUTES = {'a': {'href', 'title'}}
+
+ALLOWED_URL_SCHEMES = {'http', 'https', 'mailto'}
+
+# Elements whose content is never shown
+DROPPED_CONTENT_TAGS = {'script', 'style', 'template', 'iframe', 'object', 'noscript'}
+
+VOID_TAGS = {'br'}
+
+def safe_url(url: str) -> str:
+    """The URL if its scheme is in ALLOWED_URL_SCHEMES, otherwise an empty string"""
+    url = url.strip()
+    return url if urlsplit(url).scheme.lower() in ALLOWED_URL_SCHEMES else ""
+
+class _Sanitizer(HTMLParser):
+    """Re-emits an HTML fragment keeping only allowlisted tags and attributes"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.text: List[str] = []
+        self._open: List[str] = []
+        self._dropping = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in DROPPED_CONTENT_TAGS:
+            self._dropping += 1
+            return
+        if self._dropping or tag not in ALLOWED_TAGS:
+            if tag in ('br', 'p', 'li') and not self._dropping:
+                self.text.append(' ')
+            return
+        
+        allowed = ALLOWED_ATTRIBUTES.get(tag, set())
+        rendered = ""
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name == 'href' and not safe_url(value):
+                continue
+            rendered += f' {name}="{escape(value, quote=True)}"'
+        
+        self.parts.append(f"<{tag}{rendered}>")
+        if tag in VOID_TAGS or tag in ('p', 'li'):
+            self.text.append(' ')
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+    
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag in DROPPED_CONTENT_TAGS:
+            self._dropping -= 1
+    
+    def handle_endtag(self, tag):
+        if tag in DROPPED_CONTENT_TAGS:
+            self._dropping = max(0, self._dropping - 1)
+            return
+        if self._dropping or tag not in self._open:
+            return
+        # Close anything left open inside this element first
+        while self._open:
+            open_tag = self._open.pop()
+            self.parts.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+    
+    def handle_data(self, data):
+        if self._dropping:
+            return
+        self.parts.append(escape(data, quote=False))
+        self.text.append(data)
+    
+    def close(self):
+        super().close()
+        while self._open:
+            self.parts.append(f"</{self._open.pop()}>")
+
+def _parse(fragment: str) -> _Sanitizer:
+    parser = _Sanitizer()
+    parser.feed(fragment)
+    parser.close()
+    return parser
+
+def sanitize_html(fragment: str) -> str:
+    """Safe HTML for a summary a source delivered as HTML.
+    
+    Only the tags in ALLOWED_TAGS survive, links keep http(s)/mailto
+    targets only, every other attribute is removed, and script-like
+    elements are dropped with their content.
+    """
+    return "".join(_parse(fragment).parts)
+
+def html_to_text(fragment: str) -> str:
+    """Plain text of an HTML summary, with entities decoded"""
+    return " ".join("".join(_parse(fragment).text).split())
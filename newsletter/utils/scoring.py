@@ -0,0 +1,285 @@
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models import NewsItem
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ScoringWeights:
+    """Weights of the relevance model.
+    
+    An item's relevance is
+    
+        score * rank score + ln(source weight)
+        - age * hours since publication
+        + keyword * number of include keywords it matches
+    
+    The rank score is supplied by the caller (the agent passes
+    ScoreNormalizer's) and defaults to log(1 + item score). Rank scores are
+    signed, so a source weight is added as its logarithm instead of
+    multiplying them: it scales exp(relevance), a weight above 1 always
+    lifts a source, one below 1 always lowers it, and 0 drops it.
+    
+    A source weight applies to every source whose name starts or ends with
+    its key, so ``"Reddit"`` covers each subreddit and ``"RSS"`` every feed.
+    Unlisted sources weigh 1.
+    """
+    score: float = 1.0
+    keyword: float = 0.0
+    age: float = 0.0
+    source_weights: Dict[str, float] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        for name, value in self.source_weights.items():
+            if value < 0:
+                raise ValueError(f"Source weight for {name!r} must not be negative")
+    
+    @classmethod
+    def from_config(cls, config: Dict) -> "ScoringWeights":
+        return cls(
+            score=config.get("score_weight", 1.0),
+            keyword=config.get("keyword_weight", 0.0),
+            age=config.get("age_weight_per_hour", 0.0),
+            source_weights=config.get("source_weights", {})
+        )
+    
+    def source_weight(self, source: str) -> float:
+        weight = 1.0
+        matched = -1
+        for name, value in self.source_weights.items():
+            if len(name) > matched and (source.startswith(name) or source.endswith(name)):
+                weight, matched = value, len(name)
+        return weight
+    
+    def item_scores(self, items: Sequence[NewsItem], rank_scores: Sequence[float],
+                    now: Optional[float] = None) -> np.ndarray:
+        """Relevance of each item before keyword hits"""
+        source_weights = {source: self.source_weight(source) for source in {item.source for item in items}}
+        source_weight = np.fromiter((source_weights[item.source] for item in items), dtype=np.float64, count=len(items))
+        with np.errstate(divide='ignore'):
+            scores = self.score * np.asarray(rank_scores, dtype=np.float64) + np.log(source_weight)
+        if self.age:
+            scores -= self.age * _age_hours(_published_array(items), time.time() if now is None else now)
+        return scores
+
+def _published_array(items: Sequence[NewsItem]) -> np.ndarray:
+    """Publish times as epoch seconds, NaN where unknown"""
+    return np.fromiter(
+        (np.nan if item.published_ts is None else item.published_ts for item in items),
+        dtype=np.float64, count=len(items)
+    )
+
+def _age_hours(published: np.ndarray, now: float) -> np.ndarray:
+    """Hours since publication; undated items count as the oldest"""
+    age_hours = np.maximum(now - published, 0) / 3600
+    oldest = np.nanmax(age_hours) if np.isfinite(age_hours).any() else 0.0
+    return np.where(np.isnan(age_hours), oldest, age_hours)
+
+class ScoreNormalizer:
+    """Turns raw scores from different sources into one comparable rank score.
+    
+    Every source keeps an exponentially weighted mean and variance of the
+    scores it produces, updated from each fetched batch with weight
+    ``alpha`` and optionally persisted in ``state_path`` so they carry over
+    between runs. An item's rank score is its z-score within its source,
+    so a top Hacker News story and a top subreddit post compare evenly, and
+    sources without scores (feeds, NYT) sit at 0, the average. Time decay
+    then subtracts ``ln 2 / half_life_hours`` per hour of age, which halves
+    ``exp(rank score)`` every half-life.
+    
+    Both steps run as one vectorized pass over a batch of items.
+    """
+    
+    def __init__(self, half_life_hours: Optional[float] = 24.0, alpha: float = 0.3,
+                 state_path: Optional[str] = None):
+        self.decay_per_hour = math.log(2) / half_life_hours if half_life_hours else 0.0
+        self.alpha = alpha
+        self.state_path = state_path
+        # Source name -> [mean, variance]
+        self.stats: Dict[str, List[float]] = self._load() if state_path else {}
+    
+    def _load(self) -> Dict[str, List[float]]:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading score statistics: {e}")
+            return {}
+    
+    def save(self):
+        if not self.state_path:
+            return
+        try:
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.stats, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            logger.error(f"Error saving score statistics: {e}")
+    
+    @staticmethod
+    def _by_source(items: Sequence[NewsItem]) -> Tuple[List[str], np.ndarray]:
+        """Distinct source names and each item's index into them"""
+        index: Dict[str, int] = {}
+        codes = np.fromiter((index.setdefault(item.source, len(index)) for item in items),
+                            dtype=np.intp, count=len(items))
+        return list(index), codes
+    
+    def update(self, items: Sequence[NewsItem]):
+        """Fold a fetched batch into each source's running statistics"""
+        if not items:
+            return
+        
+        sources, codes = self._by_source(items)
+        scores = np.fromiter((item.score for item in items), dtype=np.float64, count=len(items))
+        counts = np.bincount(codes)
+        means = np.bincount(codes, weights=scores) / counts
+        variances = np.bincount(codes, weights=(scores - means[codes]) ** 2) / counts
+        
+        for source, mean, variance in zip(sources, means.tolist(), variances.tolist()):
+            stats = self.stats.get(source)
+            if stats is None:
+                self.stats[source] = [mean, variance]
+                continue
+            old_mean, old_variance = stats
+            delta = mean - old_mean
+            stats[0] = old_mean + self.alpha * delta
+            stats[1] = (1 - self.alpha) * (old_variance + self.alpha * delta * delta) + self.alpha * variance
+    
+    def rank_scores(self, items: Sequence[NewsItem], now: Optional[float] = None) -> np.ndarray:
+        """Normalized, time-decayed rank score of each item"""
+        if not items:
+            return np.zeros(0)
+        
+        sources, codes = self._by_source(items)
+        stats = np.array([self.stats.get(source, (0.0, 0.0)) for source in sources], dtype=np.float64)
+        means = stats[codes, 0]
+        stds = np.sqrt(stats[codes, 1])
+        
+        scores = np.fromiter((item.score for item in items), dtype=np.float64, count=len(items))
+        # A source whose scores never vary has nothing to rank by
+        z = np.divide(scores - means, stds, out=np.zeros_like(scores), where=stds > 0)
+        
+        if not self.decay_per_hour:
+            return z
+        age = _age_hours(_published_array(items), time.time() if now is None else now)
+        return z - self.decay_per_hour * age
+
+class BatchScorer:
+    """Ranks many subscribers against one corpus with NumPy.
+    
+    Per-item features are packed into arrays once. Subscribers are then
+    scored in chunks as a subscriber × item relevance matrix. Include and
+    exclude keywords arrive as arrays of matching item positions (from an
+    inverted index), so each row is filled by a few scatter updates instead
+    of text scans.
+    Each row's top K comes from a vectorized partial sort
+    (``argpartition``), and only those K are fully ordered.
+    
+    Ties keep the earlier corpus position, so with the default weights and
+    a corpus sorted by rank score, the result is the corpus order filtered
+    by each subscriber's preferences.
+    
+    ``item_scores`` are the items' relevance before keyword hits, as
+    ScoringWeights.item_scores computes it. When omitted they are computed
+    from ``weights`` and log(1 + item score).
+    """
+    
+    def __init__(self, items: Sequence[NewsItem], keyword_positions: Callable[[str], np.ndarray],
+                 weights: Optional[ScoringWeights] = None, now: Optional[float] = None,
+                 item_scores: Optional[Sequence[float]] = None):
+        self.items = items
+        self.keyword_positions = keyword_positions
+        self.weights = weights or ScoringWeights()
+        
+        self.scores = np.fromiter((item.score for item in items), dtype=np.float64, count=len(items))
+        if item_scores is None:
+            item_scores = self.weights.item_scores(items, np.log1p(np.maximum(self.scores, 0)), now)
+        
+        # float32 halves the memory traffic of the subscriber × item matrix
+        self.base = np.asarray(item_scores, dtype=np.float32)
+        self._lowest_score = self.scores.min() if len(items) else 0
+        self._below: Dict[float, np.ndarray] = {}
+    
+    def _below_min_score(self, min_score: float) -> np.ndarray:
+        positions = self._below.get(min_score)
+        if positions is None:
+            positions = np.flatnonzero(self.scores < min_score)
+            self._below[min_score] = positions
+        return positions
+    
+    def _relevance(self, subscribers: Sequence[Any]) -> np.ndarray:
+        relevance = np.empty((len(subscribers), len(self.items)), dtype=np.float32)
+        
+        for row, subscriber in enumerate(subscribers):
+            include = [self.keyword_positions(keyword) for keyword in subscriber.include_keywords if keyword]
+            if not include:
+                relevance[row] = self.base
+            else:
+                # Only items matching an include keyword are eligible
+                relevance[row] = -np.inf
+                positions = np.concatenate(include)
+                if self.weights.keyword:
+                    positions, hits = np.unique(positions, return_counts=True)
+                    relevance[row, positions] = self.base[positions] + self.weights.keyword * hits
+                else:
+                    relevance[row, positions] = self.base[positions]
+            
+            if subscriber.min_score > self._lowest_score:
+                relevance[row, self._below_min_score(subscriber.min_score)] = -np.inf
+            for keyword in subscriber.exclude_keywords:
+                if keyword:
+                    relevance[row, self.keyword_positions(keyword)] = -np.inf
+        return relevance
+    
+    def _top_positions(self, relevance: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Each row's k best positions and their relevance, best first, ties by position"""
+        # Selecting the k smallest of the negation is far quicker than the
+        # k largest, which makes introselect work through the whole row
+        candidates = np.argpartition(-relevance, k - 1, axis=1)[:, :k]
+        candidate_relevance = np.take_along_axis(relevance, candidates, axis=1)
+        
+        # argpartition picks arbitrarily among values tied at the cut-off;
+        # rows where that happened take the earliest tied positions instead
+        cutoff = candidate_relevance.min(axis=1)
+        straddling = np.flatnonzero(
+            np.isfinite(cutoff) & ((relevance >= cutoff[:, np.newaxis]).sum(axis=1) > k)
+        )
+        for row in straddling:
+            above = np.flatnonzero(relevance[row] > cutoff[row])
+            tied = np.flatnonzero(relevance[row] == cutoff[row])[:k - len(above)]
+            candidates[row] = np.concatenate((above, tied))
+            candidate_relevance[row] = relevance[row, candidates[row]]
+        
+        order = np.lexsort((candidates, -candidate_relevance), axis=1)
+        return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_relevance, order, axis=1)
+    
+    def rank(self, subscribers: Sequence[Any], chunk_size: int = 512) -> Iterator[Tuple[Any, List[NewsItem]]]:
+        """Yield each subscriber with their top ``max_items`` items.
+        
+        Subscribers need ``include_keywords``, ``exclude_keywords``,
+        ``min_score`` and ``max_items`` attributes. Memory is bounded by
+        ``chunk_size`` rows of the relevance matrix.
+        """
+        for start in range(0, len(subscribers), chunk_size):
+            chunk = subscribers[start:start + chunk_size]
+            k = min(max(subscriber.max_items for subscriber in chunk), len(self.items))
+            if k <= 0:
+                for subscriber in chunk:
+                    yield subscriber, []
+                continue
+            
+            positions, relevance = self._top_positions(self._relevance(chunk), k)
+            for subscriber, row, row_relevance in zip(chunk, positions, relevance):
+                row = row[:subscriber.max_items][np.isfinite(row_relevance[:subscriber.max_items])]
+                yield subscriber, [self.items[position] for position in row]
@@ -0,0 +1,103 @@
+import logging
+import time
+from typing import Iterable, List
+
+from sqlalchemy import BigInteger, Column, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..models import NewsItem
+from .dedup import item_fingerprint
+
+logger = logging.getLogger(__name__)
+
+metadata = MetaData()
+
+seen_items = Table(
+    "seen_items",
+    metadata,
+    # INTEGER (64-bit in SQLite) makes the key the table's rowid
+    Column("fingerprint", BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=False),
+    Column("url", String(2048), nullable=False),
+    Column("delivered_at", Integer, nullable=False, index=True),
+)
+
+class SeenItemStore:
+    """Persistent record of items already delivered in a newsletter.
+    
+    Items are keyed by a 64-bit fingerprint of their canonical URL, which
+    is the table's primary key, so membership checks stay index lookups at
+    millions of rows. Lookups and inserts go to the database in batches,
+    and rows older than ``retention_days`` are pruned through the index on
+    ``delivered_at``.
+    """
+    
+    def __init__(self, connection_string: str, retention_days: int = 30, batch_size: int = 500):
+        self.engine = create_engine(connection_string, future=True)
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        metadata.create_all(self.engine)
+    
+    def _batches(self, values: List) -> Iterable[List]:
+        for start in range(0, len(values), self.batch_size):
+            yield values[start:start + self.batch_size]
+    
+    def filter_unseen(self, items: List[NewsItem]) -> List[NewsItem]:
+        """Drop items whose fingerprint was already delivered"""
+        if not items:
+            return []
+        
+        fingerprints = [item_fingerprint(item) for item in items]
+        seen = set()
+        with self.engine.connect() as conn:
+            for batch in self._batches(list(set(fingerprints))):
+                query = select(seen_items.c.fingerprint).where(seen_items.c.fingerprint.in_(batch))
+                seen.update(conn.execute(query).scalars())
+        
+        return [item for item, fingerprint in zip(items, fingerprints) if fingerprint not in seen]
+    
+    def mark_delivered(self, items: Iterable[NewsItem]):
+        """Record items, and the stories clustered into them, as delivered"""
+        now = int(time.time())
+        rows = {}
+        for item in items:
+            for delivered in [item, *item.related]:
+                fingerprint = item_fingerprint(delivered)
+                rows[fingerprint] = {
+                    "fingerprint": fingerprint,
+                    "url": delivered.url[:2048],
+                    "delivered_at": now
+                }
+        if not rows:
+            return
+        
+        dialect = self.engine.dialect.name
+        with self.engine.begin() as conn:
+            for batch in self._batches(list(rows.values())):
+                if dialect == "sqlite":
+                    conn.execute(sqlite.insert(seen_items).on_conflict_do_nothing(), batch)
+                elif dialect == "postgresql":
+                    conn.execute(postgresql.insert(seen_items).on_conflict_do_nothing(), batch)
+                else:
+                    existing = set(conn.execute(
+                        select(seen_items.c.fingerprint).where(
+                            seen_items.c.fingerprint.in_([row["fingerprint"] for row in batch])
+                        )
+                    ).scalars())
+                    new_rows = [row for row in batch if row["fingerprint"] not in existing]
+                    if new_rows:
+                        conn.execute(seen_items.insert(), new_rows)
+        
+        logger.info(f"Recorded {len(rows)} delivered items")
+    
+    def prune(self) -> int:
+        """Delete records older than the retention window"""
+        cutoff = int(time.time()) - self.retention_days * 86400
+        with self.engine.begin() as conn:
+            result = conn.execute(seen_items.delete().where(seen_items.c.delivered_at < cutoff))
+        
+        if result.rowcount:
+            logger.info(f"Pruned {result.rowcount} delivered items older than {self.retention_days} days")
+        return result.rowcount
+    
+    def close(self):
+        self.engine.dispose()
@@ -0,0 +1,35 @@
+import json
+import os
+import sys
+
+import pytest
+
+# Let the tests import the newsletter package from a plain checkout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from newsletter.agent import NewsletterAgent  # noqa: E402
+
+@pytest.fixture
+def make_agent(tmp_path):
+    """Build a NewsletterAgent from a minimal config written to ``tmp_path``.
+    
+    Keyword arguments name config sections; dict values are merged into
+    the defaults below, so a test only states what it changes.
+    """
+    def make(**sections) -> NewsletterAgent:
+        config = {
+            "sources": {},
+            "preferences": {"max_items": 10, "include_keywords": [], "exclude_keywords": [], "min_score": 0},
+            "output": {"format": "markdown", "save_to_file": False,
+                       "filename_template": str(tmp_path / "newsletter_{date}.md")}
+        }
+        for name, section in sections.items():
+            if isinstance(section, dict) and isinstance(config.get(name), dict):
+                config[name] = {**config[name], **section}
+            else:
+                config[name] = section
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps(config))
+        return NewsletterAgent(str(path))
+    
+    return make
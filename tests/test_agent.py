@@ -0,0 +1,55 @@
+import asyncio
+import re
+import time
+
+from newsletter.agent import PREVIEW_CHARS
+from newsletter.models import NewsItem
+
+SAVE_ALL_FORMATS = {"formats": ["markdown", "html", "text"], "save_to_file": True}
+
+def make_items(count):
+    now = int(time.time())
+    return [NewsItem(title=f"Story {i}", url=f"https://example.com/{i}", summary="Summary " * 20,
+                     source="Hacker News", score=count - i, published_ts=now) for i in range(count)]
+
+def test_save_formats_streams_files_and_returns_a_preview(make_agent):
+    agent = make_agent(output=SAVE_ALL_FORMATS)
+    preview, filenames = agent.save_formats(make_items(50))
+    
+    assert [name.rsplit(".", 1)[1] for name in filenames] == ["md", "html", "txt"]
+    with open(filenames[0], encoding="utf-8") as f:
+        document = f.read()
+    assert len(document) > PREVIEW_CHARS
+    assert preview == document[:PREVIEW_CHARS]
+
+def test_preview_without_saving(make_agent):
+    agent = make_agent()
+    items = make_items(50)
+    assert agent.preview_newsletter(items) == agent.generate_newsletter(items)[:PREVIEW_CHARS]
+
+def test_sources_are_built_once_per_agent(make_agent):
+    agent = make_agent()
+    built = []
+    
+    class Source:
+        async def fetch(self):
+            return make_items(3)
+    
+    def build_sources():
+        built.append(1)
+        return [("Stand-in", Source(), 5)]
+    
+    agent._build_sources = build_sources
+    
+    async def runs():
+        async with agent:
+            for _ in range(3):
+                await agent.aggregate_content()
+    
+    asyncio.run(runs())
+    assert len(built) == 1
+
+def test_filename_time_placeholder(make_agent):
+    agent = make_agent(output={"save_to_file": True, "filename_template": "newsletter_{date}_{time}.md"})
+    filename = agent._output_filename(agent._output_generators()[0])
+    assert re.fullmatch(r"newsletter_\d{4}-\d{2}-\d{2}_\d{4}\.md", filename)
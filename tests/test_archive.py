@@ -0,0 +1,39 @@
+import asyncio
+
+from newsletter.models import NewsItem
+from newsletter.utils.archive import NewsletterArchive
+
+def test_html_summaries_are_indexed_as_text(tmp_path):
+    archive = NewsletterArchive(str(tmp_path / "archive.db"))
+    archive.record_edition([
+        NewsItem(title="Compiler news", url="https://example.com/1", source="Blog (RSS)",
+                 summary='<p>Builds are <a href="https://example.com">fast</a></p>', summary_is_html=True),
+        NewsItem(title="Mail", url="https://example.com/2", source="Gmail", summary="From: <p@example.com>")
+    ])
+    
+    assert [item.title for item in archive.search("fast")] == ["Compiler news"]
+    assert archive.search("href") == []
+    assert archive.search("fast")[0].summary == "Builds are fast"
+    # Plain-text summaries are stored as they are
+    assert [item.title for item in archive.search("p")] == ["Mail"]
+    archive.close()
+
+def test_agent_archives_every_run_across_contexts(make_agent, tmp_path):
+    path = tmp_path / "archive.db"
+    agent = make_agent(archive={"enabled": True, "path": str(path)})
+    
+    async def aggregate_content():
+        return [NewsItem(title="Archived story", url="https://example.com/1", source="Hacker News", score=10)]
+    
+    agent.aggregate_content = aggregate_content
+    
+    async def runs():
+        # Leaving the context closes the archive; entering again must reopen it
+        for _ in range(2):
+            async with agent:
+                await agent.run()
+    
+    asyncio.run(runs())
+    archive = NewsletterArchive(str(path))
+    assert len({item.edition_id for item in archive.search("archived")}) == 2
+    archive.close()
@@ -0,0 +1,120 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from newsletter.utils.disk_cache import DiskCache
+from newsletter.utils.http_cache import CacheEntry, HTTPCache
+
+class StandInFeedServer:
+    """HTTP server whose one resource carries an ETag and honours If-None-Match"""
+    
+    def __init__(self, etag='"v1"'):
+        self.etag = etag
+        self.requests = 0
+        self.not_modified = 0
+        app = web.Application()
+        app.router.add_get("/items", self._items)
+        self.server = TestServer(app)
+    
+    @property
+    def url(self) -> str:
+        return str(self.server.make_url("/items"))
+    
+    async def __aenter__(self):
+        await self.server.start_server()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.server.close()
+    
+    async def _items(self, request):
+        self.requests += 1
+        if self.etag and request.headers.get("If-None-Match") == self.etag:
+            self.not_modified += 1
+            return web.Response(status=304)
+        headers = {"ETag": self.etag} if self.etag else {}
+        return web.json_response({"items": [1, 2, 3]}, headers=headers)
+
+def fetch(cache, times, namespace="default", etag='"v1"'):
+    """Fetch the stand-in resource ``times`` times; return the server and values"""
+    async def scenario():
+        async with StandInFeedServer(etag) as server, aiohttp.ClientSession() as session:
+            values = [await cache.get(session, server.url, namespace=namespace) for _ in range(times)]
+        return server, values
+    
+    return asyncio.run(scenario())
+
+def test_fresh_disk_entries_skip_the_network(tmp_path):
+    store = DiskCache(str(tmp_path), default_ttl=60)
+    server, values = fetch(HTTPCache(store), 3, namespace="hackernews")
+    
+    assert values == [{"items": [1, 2, 3]}] * 3
+    assert server.requests == 1
+    assert store.stats()["hits"] == {"hackernews": 2}
+    assert store.stats()["misses"] == {"hackernews": 1}
+
+def test_expired_disk_entries_are_revalidated(tmp_path):
+    store = DiskCache(str(tmp_path), default_ttl=60, ttls={"rss": 0})
+    cache = HTTPCache(store)
+    server, values = fetch(cache, 2, namespace="rss")
+    
+    assert values[0] == values[1]
+    assert server.requests == 2
+    assert server.not_modified == 1
+    assert (cache.downloaded, cache.revalidated) == (1, 1)
+    assert store.stats()["misses"] == {"rss": 2}
+
+def test_memory_cache_revalidates_with_304():
+    cache = HTTPCache()
+    server, values = fetch(cache, 2)
+    
+    assert values[0] == values[1]
+    assert server.not_modified == 1
+    assert (cache.downloaded, cache.revalidated) == (1, 1)
+
+def test_memory_http_cache_is_bounded():
+    cache = HTTPCache(max_entries=2)
+    for key in ("a", "b"):
+        cache._save("default", key, CacheEntry(key))
+    cache._load("default", "a")
+    cache._save("default", "c", CacheEntry("c"))
+    assert list(cache._entries) == ["a", "c"]
+
+def test_memory_cache_drops_responses_without_validators():
+    cache = HTTPCache()
+    server, _ = fetch(cache, 2, etag=None)
+    
+    assert server.requests == 2
+    assert cache.downloaded == 2
+    assert not cache._entries
+
+def test_disk_entries_are_reused_after_a_restart(tmp_path):
+    async def scenario():
+        async with StandInFeedServer() as server, aiohttp.ClientSession() as session:
+            await HTTPCache(DiskCache(str(tmp_path), default_ttl=60)).get(session, server.url)
+            # A new process finds the entry through the files alone
+            restarted = DiskCache(str(tmp_path), default_ttl=60)
+            value = await HTTPCache(restarted).get(session, server.url)
+        return server, restarted, value
+    
+    server, restarted, value = asyncio.run(scenario())
+    assert value == {"items": [1, 2, 3]}
+    assert server.requests == 1
+    assert restarted.stats()["entries"] == 1
+    assert restarted.stats()["hits"] == {"default": 1}
+
+def test_disk_cache_evicts_least_recently_used_past_its_size(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000)
+    for key in ("a", "b"):
+        cache.set("default", key, key * 400)
+    cache.get("default", "a")
+    cache.set("default", "c", "c" * 400)
+    
+    assert cache.get("default", "b") is None
+    assert cache.get("default", "a") == "a" * 400
+    assert cache.get("default", "c") == "c" * 400
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= 1000
+    assert len(list(tmp_path.glob("*.pkl"))) == 2
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import signal
+import time
+
+import pytest
+
+from newsletter.daemon import NewsletterDaemon
+
+def make_daemon(make_agent, tmp_path, interval, runs):
+    """Daemon whose runs are replaced by ``runs(daemon, started)``; started collects start times"""
+    # The fixture writes the config the daemon loads
+    make_agent()
+    daemon = NewsletterDaemon(str(tmp_path / "config.json"), interval=interval)
+    started = []
+    
+    async def run():
+        started.append(time.monotonic())
+        await runs(daemon, started)
+    
+    daemon.agent.run = run
+    return daemon, started
+
+def serve(daemon):
+    asyncio.run(asyncio.wait_for(daemon.serve(), timeout=5))
+
+def test_runs_keep_their_cadence(make_agent, tmp_path):
+    async def runs(daemon, started):
+        if len(started) == 3:
+            daemon.stop()
+    
+    daemon, started = make_daemon(make_agent, tmp_path, 0.1, runs)
+    serve(daemon)
+    
+    assert daemon.runs == 3
+    gaps = [later - earlier for earlier, later in zip(started, started[1:])]
+    assert all(gap == pytest.approx(0.1, abs=0.05) for gap in gaps)
+
+def test_overrunning_run_skips_missed_slots(make_agent, tmp_path):
+    async def runs(daemon, started):
+        if len(started) == 1:
+            # Spans the second slot, so the next run waits for the third
+            await asyncio.sleep(0.15)
+        else:
+            daemon.stop()
+    
+    daemon, started = make_daemon(make_agent, tmp_path, 0.1, runs)
+    serve(daemon)
+    
+    assert daemon.runs == 2
+    assert started[1] - started[0] == pytest.approx(0.2, abs=0.04)
+
+def test_failed_runs_are_counted_and_do_not_stop_the_daemon(make_agent, tmp_path):
+    async def runs(daemon, started):
+        if len(started) == 2:
+            daemon.stop()
+        raise RuntimeError("source down")
+    
+    daemon, started = make_daemon(make_agent, tmp_path, 0.05, runs)
+    serve(daemon)
+    
+    assert (daemon.runs, daemon.failures) == (2, 2)
+
+@pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="no SIGHUP on this platform")
+def test_sighup_starts_a_run_immediately(make_agent, tmp_path):
+    async def runs(daemon, started):
+        if len(started) == 1:
+            asyncio.get_running_loop().call_later(0.05, os.kill, os.getpid(), signal.SIGHUP)
+        else:
+            daemon.stop()
+    
+    daemon, started = make_daemon(make_agent, tmp_path, 3600, runs)
+    serve(daemon)
+    
+    assert daemon.runs == 2
+    assert started[1] - started[0] < 1
+
+def test_sigterm_stops_after_the_current_run(make_agent, tmp_path):
+    finished = []
+    
+    async def runs(daemon, started):
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0.05)
+        finished.append(True)
+    
+    daemon, started = make_daemon(make_agent, tmp_path, 0.01, runs)
+    serve(daemon)
+    
+    assert daemon.runs == 1
+    assert finished == [True]
+    assert daemon.agent.session.closed
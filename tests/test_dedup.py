@@ -0,0 +1,81 @@
+import pytest
+
+from newsletter.models import NewsItem
+from newsletter.utils.dedup import (
+    Deduplicator, NearDuplicateClusterer, _content_words, _shingles, canonicalize_url, item_fingerprint
+)
+
+DIFFERENT_STORIES = [
+    ("Rust 1.80 released", "Rust 1.81 released"),
+    ("Apple stock rises 5% after earnings", "Apple stock falls 5% after earnings"),
+    ("Ask HN: Who is hiring?", "Ask HN: Who wants to be hired?"),
+    ("Show HN: A Rust web framework", "Show HN: A Go web framework"),
+]
+
+def item(title, summary="", source="Hacker News"):
+    return NewsItem(title=title, url=f"https://{source.replace(' ', '').lower()}.example/{hash(title)}",
+                    summary=summary, source=source)
+
+def similarity(first, second):
+    first, second = _shingles(_content_words(first)[0]), _shingles(_content_words(second)[0])
+    return len(first & second) / len(first | second)
+
+@pytest.mark.parametrize("first, second", DIFFERENT_STORIES)
+def test_different_stories_stay_apart(first, second):
+    clusterer = NearDuplicateClusterer()
+    a, b = item(first), item(second)
+    assert clusterer.add(a) is a
+    assert clusterer.add(b) is b
+    assert clusterer.clusters == 2
+    assert not a.related
+
+@pytest.mark.parametrize("first, second", DIFFERENT_STORIES)
+def test_different_stories_fall_below_the_threshold(first, second):
+    assert similarity(item(first), item(second)) < NearDuplicateClusterer().threshold
+
+def test_same_story_from_two_sources_is_merged():
+    clusterer = NearDuplicateClusterer()
+    first = item("OpenAI announces GPT-5 with improved reasoning and coding abilities")
+    second = item("OpenAI announces GPT-5 with improved reasoning and coding abilities - The Verge",
+                  source="Tech (RSS)")
+    assert clusterer.add(first) is first
+    assert clusterer.add(second) is first
+    assert first.related == [second]
+    assert clusterer.clusters == 1
+
+def test_short_titles_are_never_clustered():
+    clusterer = NearDuplicateClusterer()
+    first, second = item("Rust 1.80 released"), item("Rust 1.80 released")
+    clusterer.add(first)
+    assert clusterer.add(second) is second
+
+def test_exact_duplicate_keeps_its_source_credited():
+    deduplicator = Deduplicator()
+    first = NewsItem(title="Story", url="https://example.com/story?utm_source=hn", source="Hacker News", score=10)
+    second = NewsItem(title="Story", url="https://www.example.com/story", source="Reddit r/tech", score=50)
+    deduplicator.add(first)
+    survivor, new = deduplicator.add(second)
+    assert survivor is first and not new
+    assert first.related == [second]
+    assert first.score == 50
+    
+    # Seeing the same item again does not list it twice
+    deduplicator.add(second)
+    assert first.related == [second]
+
+def test_ref_parameter_is_kept():
+    assert canonicalize_url("https://example.com/page?ref=v2") != canonicalize_url("https://example.com/page?ref=v3")
+    assert canonicalize_url("https://example.com/page?ref_src=twsrc") == canonicalize_url("https://example.com/page")
+
+def test_gmail_messages_are_distinct():
+    first = NewsItem(title="Email: Hello", url="https://mail.google.com/mail/u/0/#inbox/18f1a", source="Gmail")
+    second = NewsItem(title="Email: Hello", url="https://mail.google.com/mail/u/0/#inbox/18f2b", source="Gmail")
+    deduplicator = Deduplicator()
+    assert deduplicator.add(first) == (first, True)
+    assert deduplicator.add(second) == (second, True)
+    assert len(deduplicator) == 2
+    assert item_fingerprint(first) != item_fingerprint(second)
+
+def test_in_page_fragments_are_dropped():
+    assert canonicalize_url("https://example.com/post#comments") == canonicalize_url("https://example.com/post")
+    assert canonicalize_url("https://app.example.com/#!/story/1") != canonicalize_url("https://app.example.com/#!/story/2")
@@ -0,0 +1,198 @@
+import asyncio
+import time
+
+from newsletter.models import NewsItem
+from newsletter.personalization import Subscriber
+from newsletter.utils.email_sender import AsyncEmailSender, build_message
+
+class StandInSMTPServer:
+    """Minimal asyncio SMTP server that records accepted messages"""
+    
+    def __init__(self, reject=(), pipelining=True, busy=0):
+        self.reject = set(reject)
+        self.pipelining = pipelining
+        # Number of transactions to refuse with 421 before accepting mail
+        self.busy = busy
+        self.messages = []
+        self.connections = 0
+        self.server = None
+        self._writers = set()
+    
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+    
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._session, "127.0.0.1", 0)
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.drop_sessions()
+        self.server.close()
+        await self.server.wait_closed()
+    
+    def drop_sessions(self):
+        """Close every open session from the server side, as an idle timeout would"""
+        for writer in self._writers:
+            writer.close()
+        self._writers.clear()
+    
+    async def _session(self, reader, writer):
+        self.connections += 1
+        self._writers.add(writer)
+        writer.write(b"220 stand-in ESMTP\r\n")
+        sender, recipients = None, []
+        while line := await reader.readline():
+            command = line.decode().rstrip("\r\n")
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                extensions = ["250-stand-in"] + (["250-PIPELINING"] if self.pipelining else []) + ["250 AUTH PLAIN"]
+                writer.write(("\r\n".join(extensions) + "\r\n").encode())
+            elif verb == "AUTH":
+                writer.write(b"235 Authenticated\r\n")
+            elif verb == "MAIL" and self.busy:
+                self.busy -= 1
+                sender = None
+                writer.write(b"421 Service not available, closing transmission channel\r\n")
+            elif verb == "MAIL":
+                sender, recipients = command[10:].strip("<>"), []
+                writer.write(b"250 OK\r\n")
+            elif verb in ("RCPT", "DATA") and sender is None:
+                writer.write(b"503 Bad sequence of commands\r\n")
+            elif verb == "RCPT":
+                recipient = command[8:].strip("<>")
+                if recipient in self.reject:
+                    writer.write(b"550 No such user\r\n")
+                else:
+                    recipients.append(recipient)
+                    writer.write(b"250 OK\r\n")
+            elif verb == "DATA":
+                if not recipients:
+                    writer.write(b"554 No valid recipients\r\n")
+                else:
+                    writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                    await writer.drain()
+                    data = []
+                    while (line := await reader.readline()) != b".\r\n":
+                        data.append(line[1:] if line.startswith(b"..") else line)
+                    self.messages.append((sender, recipients, b"".join(data)))
+                    writer.write(b"250 Queued\r\n")
+            elif verb == "RSET":
+                recipients = []
+                writer.write(b"250 OK\r\n")
+            elif verb == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"502 Not implemented\r\n")
+            await writer.drain()
+        self._writers.discard(writer)
+        writer.close()
+
+def test_send_many_delivers_and_reports_refusals():
+    async def scenario():
+        async with StandInSMTPServer(reject={"gone@example.com"}) as server:
+            sender = AsyncEmailSender("127.0.0.1", server.port, starttls=False, pool_size=2)
+            messages = [
+                build_message("news@example.com", f"reader{i}@example.com", "Hi", f"Body {i}\n.starts with a dot")
+                for i in range(5)
+            ] + [build_message("news@example.com", "gone@example.com", "Hi", "Body")]
+            stats = await sender.send_many(messages)
+            await sender.close()
+            return server, stats
+    
+    server, stats = asyncio.run(scenario())
+    assert stats.sent == 5
+    assert stats.failed == 1
+    assert stats.failures[0][0] == "gone@example.com"
+    assert sorted(recipients[0] for _, recipients, _ in server.messages) == [
+        f"reader{i}@example.com" for i in range(5)
+    ]
+    assert all(b"\r\n.starts with a dot" in data for _, _, data in server.messages)
+
+def test_send_survives_a_stale_pool():
+    async def scenario():
+        async with StandInSMTPServer() as server:
+            sender = AsyncEmailSender("127.0.0.1", server.port, starttls=False, pool_size=3)
+            messages = [build_message("news@example.com", f"reader{i}@example.com", "Hi", "Body") for i in range(3)]
+            first = await sender.send_many(messages)
+            assert len(sender._idle) == 3
+            
+            # The server drops every idle session between runs
+            server.drop_sessions()
+            await asyncio.sleep(0.05)
+            second = await sender.send_many([build_message("news@example.com", "late@example.com", "Hi", "Body")])
+            await sender.close()
+            return server, first, second
+    
+    server, first, second = asyncio.run(scenario())
+    assert (first.sent, second.sent, second.failed) == (3, 1, 0)
+    assert server.messages[-1][1] == ["late@example.com"]
+
+def test_idle_connections_past_the_timeout_are_not_reused():
+    async def scenario():
+        async with StandInSMTPServer() as server:
+            sender = AsyncEmailSender("127.0.0.1", server.port, starttls=False, pool_size=1, idle_timeout=0)
+            for i in range(2):
+                await sender.send_message(build_message("news@example.com", f"r{i}@example.com", "Hi", "Body"))
+            await sender.close()
+            return server
+    
+    server = asyncio.run(scenario())
+    assert server.connections == 2
+    assert len(server.messages) == 2
+
+def test_421_is_retried_on_a_new_connection():
+    async def scenario():
+        async with StandInSMTPServer(busy=1) as server:
+            sender = AsyncEmailSender("127.0.0.1", server.port, starttls=False, pool_size=1)
+            stats = await sender.send_many([build_message("news@example.com", "reader@example.com", "Hi", "Body")])
+            await sender.close()
+            return server, stats
+    
+    server, stats = asyncio.run(scenario())
+    assert (stats.sent, stats.failed) == (1, 0)
+    assert server.connections == 2
+
+def run_agent(make_agent, tmp_path, reject=()):
+    """Run one edition against a stand-in SMTP server; return the server and unseen items"""
+    now = int(time.time())
+    items = [NewsItem(title=f"Story {i}", url=f"https://example.com/{i}", source="Hacker News",
+                      score=10 - i, published_ts=now) for i in range(3)]
+    
+    async def scenario():
+        async with StandInSMTPServer(reject=reject) as server:
+            agent = make_agent(
+                output={"email_from": "news@example.com", "email_to": "reader@example.com"},
+                smtp={"host": "127.0.0.1", "port": server.port, "starttls": False},
+                database={"track_seen_items": True, "connection_string": f"sqlite:///{tmp_path / 'newsletter.db'}"}
+            )
+            async with agent:
+                async def aggregate_content():
+                    return items
+                agent.aggregate_content = aggregate_content
+                await agent.run()
+                unseen = agent.seen_store.filter_unseen(items)
+            return server, unseen
+    
+    return asyncio.run(scenario())
+
+def test_items_are_recorded_after_the_newsletter_is_accepted(make_agent, tmp_path):
+    server, unseen = run_agent(make_agent, tmp_path)
+    assert len(server.messages) == 1
+    assert unseen == []
+
+def test_items_stay_unseen_when_delivery_fails(make_agent, tmp_path):
+    server, unseen = run_agent(make_agent, tmp_path, reject={"reader@example.com"})
+    assert server.messages == []
+    assert len(unseen) == 3
+
+def test_digest_text_part_matches_the_newsletter_email(make_agent):
+    agent = make_agent(output={"email_from": "news@example.com"})
+    items = [NewsItem(title="Story", url="https://example.com/1", source="Hacker News", score=1)]
+    subscriber = Subscriber(id="a", email="a@example.com")
+    
+    message = next(agent._digest_messages([subscriber], {"a": items}))
+    text = message.get_body(("plain",)).get_content()
+    assert text.replace("\r\n", "\n") == "".join(agent.render_newsletter(items, agent._generator("text")))
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from newsletter.utils.filters import KeywordMatcher, TopKRanker
+
+TEXTS = [
+    "Rust 1.80 released with LazyCell",
+    "Python packaging gets a new resolver",
+    "Trusting trust revisited",
+    "Frustrated developers rewrite it in Go",
+    "Pythonic patterns for data pipelines",
+]
+
+KEYWORD_LISTS = [(), ("rust",), ("RUST", "python"), ("ust", "rus"), ("py", "pythonic"), ("in go", "1.80"), ("zzz",)]
+
+@pytest.mark.parametrize("include", KEYWORD_LISTS)
+@pytest.mark.parametrize("exclude", KEYWORD_LISTS)
+def test_keyword_matcher_agrees_with_a_substring_scan(include, exclude):
+    matcher = KeywordMatcher.compile(include, exclude)
+    for text in TEXTS:
+        lowered = text.lower()
+        expected = ((not include or any(keyword.lower() in lowered for keyword in include))
+                    and not any(keyword.lower() in lowered for keyword in exclude))
+        assert matcher.matches(text) == expected, text
+
+def test_empty_keyword_matches_nothing():
+    # A plain substring test would find "" in every text
+    assert all(KeywordMatcher.compile((), ("",)).matches(text) for text in TEXTS)
+    matcher = KeywordMatcher.compile(("", "rust"), ())
+    assert [text for text in TEXTS if matcher.matches(text)] == [TEXTS[0], TEXTS[2], TEXTS[3]]
+
+@pytest.mark.parametrize("k", [0, 1, 5, 50])
+def test_top_k_agrees_with_a_stable_sort(k):
+    rng = random.Random(k)
+    # Few distinct keys, so ties are common
+    items = [(rng.randint(0, 9), i) for i in range(200)]
+    ranker = TopKRanker(k, key=lambda item: item[0])
+    ranker.extend(items)
+    
+    expected = sorted(items, key=lambda item: item[0], reverse=True)[:k]
+    assert ranker.results() == expected
+    assert len(ranker) == len(expected)
+
+def test_top_k_ties_keep_the_first_arrival():
+    ranker = TopKRanker(2, key=len)
+    ranker.extend(["aa", "bb", "cc", "d"])
+    assert ranker.results() == ["aa", "bb"]
+
+def test_pushing_a_held_item_re_ranks_it():
+    items = [{"name": name, "score": score} for name, score in [("a", 5), ("b", 4), ("c", 3)]]
+    ranker = TopKRanker(2, key=lambda item: item["score"])
+    ranker.extend(items)
+    assert [item["name"] for item in ranker.results()] == ["a", "b"]
+    
+    # A merged duplicate raises b's score; it is re-ranked, not added twice
+    items[1]["score"] = 9
+    ranker.push(items[1])
+    assert [item["name"] for item in ranker.results()] == ["b", "a"]
+    assert len(ranker) == 2
+    
+    # Lowering a held item's key lets a later item evict it
+    ranker.push(items[0], key=1)
+    ranker.push(items[2])
+    assert [item["name"] for item in ranker.results()] == ["b", "c"]
@@ -0,0 +1,58 @@
+from newsletter.generators import HTMLGenerator, MarkdownGenerator, TextGenerator, build_document
+from newsletter.generators import html as html_module
+from newsletter.models import NewsItem
+
+def render(generator, items):
+    return "".join(generator.render(build_document(items)))
+
+def gmail_item():
+    return NewsItem(title="Hello", url="https://mail.example/1", summary="From: Jane Doe <jane@x.com>", source="Gmail")
+
+def rss_item():
+    return NewsItem(
+        title="Feed post", url="https://blog.example/post", source="Blog (RSS)", summary_is_html=True,
+        summary='<p>Hi <b>there</b><script>alert(1)</script> <a href="javascript:x()" onclick="y()">link</a></p>'
+    )
+
+def test_plain_text_summary_is_escaped_in_html():
+    output = render(HTMLGenerator(), [gmail_item()])
+    assert "From: Jane Doe &lt;jane@x.com&gt;" in output
+    assert "<jane@x.com>" not in output
+
+def test_html_summary_is_sanitized():
+    output = render(HTMLGenerator(), [rss_item()])
+    assert "<p>Hi <b>there</b> <a>link</a></p>" in output
+    assert "script" not in output
+    assert "alert" not in output
+    assert "javascript" not in output
+    assert "onclick" not in output
+
+def test_fallback_renderer_matches_templates(monkeypatch):
+    items = [gmail_item(), rss_item()]
+    templated = render(HTMLGenerator(), items)
+    monkeypatch.setattr(html_module, "JINJA2_AVAILABLE", False)
+    assert render(HTMLGenerator(), items) == templated
+
+def test_text_keeps_plain_summaries_and_strips_html_ones():
+    output = render(TextGenerator(), [gmail_item(), rss_item()])
+    assert "Summary: From: Jane Doe <jane@x.com>" in output
+    assert "Summary: Hi there link" in output
+
+def test_markdown_uses_plain_text_summary():
+    output = render(MarkdownGenerator(), [rss_item()])
+    assert "**Summary:** Hi there link" in output
+
+def test_template_autoescapes_entry_fields():
+    item = NewsItem(title="<b>Title</b>", url="https://example.com/?a=1&b=2", summary="x", source="Gmail")
+    output = render(HTMLGenerator(), [item])
+    assert "<h3>&lt;b&gt;Title&lt;/b&gt;</h3>" in output
+    assert 'href="https://example.com/?a=1&amp;b=2"' in output
+
+def test_unsafe_link_schemes_are_dropped():
+    item = NewsItem(title="Bad link", url="javascript:alert(1)", source="Blog (RSS)")
+    item.related.append(NewsItem(title="Mirror", url=" JavaScript:alert(2)", source="Other (RSS)"))
+    item.related.append(NewsItem(title="Copy", url="https://example.com/copy", source="Good (RSS)"))
+    for generator in (HTMLGenerator(), MarkdownGenerator(), TextGenerator()):
+        output = render(generator, [item])
+        assert "alert" not in output
+        assert "https://example.com/copy" in output
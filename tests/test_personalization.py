@@ -0,0 +1,63 @@
+import random
+import time
+
+import pytest
+
+from newsletter.models import NewsItem
+from newsletter.personalization import PersonalizationEngine, Subscriber
+
+TITLES = [
+    "Rust 1.80 released with LazyCell",
+    "Python packaging gets a new resolver",
+    "Trusting trust revisited",
+    "Frustrated developers rewrite it in Go",
+    "Pythonic patterns for data pipelines",
+]
+
+@pytest.fixture
+def engine():
+    items = [NewsItem(title=title, url=f"https://example.com/{i}", score=len(TITLES) - i)
+             for i, title in enumerate(TITLES)]
+    return PersonalizationEngine(items, key=lambda item: item.score)
+
+@pytest.mark.parametrize("keyword", ["rust", "RUST", "ust", "python", "pythonic", "thon", "y", "1.80", "in go", "zzz", "lazycel"])
+def test_keyword_matches_agree_with_a_substring_scan(engine, keyword):
+    expected = {position for position, item in enumerate(engine.items)
+                if keyword.lower() in f"{item.title} {item.summary}".lower()}
+    assert engine.keyword_matches(keyword) == expected
+
+def test_subscriber_without_id_or_email_is_rejected():
+    with pytest.raises(ValueError):
+        Subscriber.from_config({"include_keywords": ["rust"]}, {})
+
+def test_subscriber_id_falls_back_to_email():
+    assert Subscriber.from_config({"email": "a@example.com"}, {}).id == "a@example.com"
+
+def test_duplicate_subscriber_ids_are_rejected(make_agent):
+    agent = make_agent(subscribers=[
+        {"id": "team", "email": "a@example.com", "include_keywords": ["rust"]},
+        {"id": "team", "email": "b@example.com", "include_keywords": ["python"]}
+    ])
+    with pytest.raises(ValueError, match="team"):
+        agent._load_subscribers()
+
+def test_select_respects_a_zero_item_limit(engine):
+    assert engine.select(Subscriber(id="none", max_items=0)) == []
+
+WORDS = ["rust", "python", "release", "compiler", "trust", "go", "gopher", "data", "pipeline", "lazy", "cell"]
+KEYWORDS = ["rust", "ust", "python", "go", "comp", "data pipe", "lazy", "y", "zzz", "release"]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rank_all_agrees_with_select_all(seed):
+    rng = random.Random(seed)
+    now = int(time.time())
+    items = [NewsItem(title=" ".join(rng.choices(WORDS, k=4)), url=f"https://example.com/{i}",
+                      summary=" ".join(rng.choices(WORDS, k=6)), score=score, published_ts=now)
+             for i, score in enumerate(rng.sample(range(1, 1000), 200))]
+    subscribers = [Subscriber(id=str(i), include_keywords=rng.sample(KEYWORDS, rng.randint(0, 2)),
+                              exclude_keywords=rng.sample(KEYWORDS, rng.randint(0, 2)),
+                              min_score=rng.choice([0, 100, 500]), max_items=rng.randint(0, 15))
+                   for i in range(40)]
+    engine = PersonalizationEngine(items, key=lambda item: item.score)
+    
+    assert engine.rank_all(subscribers, chunk_size=16) == engine.select_all(subscribers)
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from newsletter.models import NewsItem
+from newsletter.utils.scoring import ScoringWeights
+
+# Decay off, so ranks depend on scores alone
+NO_DECAY = {"half_life_hours": None}
+
+def batch(source, scores, prefix):
+    now = int(time.time())
+    return [NewsItem(title=f"{prefix} story number {i}", url=f"https://{prefix}.example/{i}", source=source,
+                     score=score, published_ts=now) for i, score in enumerate(scores)]
+
+def shared_story(source, score):
+    return NewsItem(title="Shared story", url="https://news.example/shared", source=source, score=score,
+                    published_ts=int(time.time()))
+
+def rank(agent, order):
+    # Hacker News scores around 100, Reddit around 10,000
+    hn = batch("Hacker News", [50, 100, 150], "hn") + [shared_story("Hacker News", 400)]
+    reddit = batch("Reddit r/news", [9000, 10000, 11000], "reddit") + [shared_story("Reddit r/news", 9000)]
+    batches = {"hn": hn, "reddit": reddit}
+    for name in order:
+        agent.score_normalizer.update(batches[name])
+    return agent._filter_and_rank_items([item for name in order for item in batches[name]])
+
+def test_merged_story_rank_does_not_depend_on_arrival_order(make_agent):
+    first = rank(make_agent(ranking=NO_DECAY), ["hn", "reddit"])
+    assert first[0].title == "Shared story"
+    
+    second = rank(make_agent(ranking=NO_DECAY), ["reddit", "hn"])
+    assert second[0].title == "Shared story"
+    assert second[0].rank_score == pytest.approx(first[0].rank_score)
+
+def test_source_weight_boost_never_lowers_an_item():
+    items = batch("Hacker News", [10, 20], "hn")
+    # Signed rank scores, one below the source average
+    rank_scores = [-1.5, 0.5]
+    plain = ScoringWeights().item_scores(items, rank_scores)
+    boosted = ScoringWeights(source_weights={"Hacker News": 2.0}).item_scores(items, rank_scores)
+    assert (boosted > plain).all()
+    dropped = ScoringWeights(source_weights={"Hacker News": 0.0}).item_scores(items, rank_scores)
+    assert (dropped == float("-inf")).all()
+
+def test_run_applies_ranking_weights(make_agent):
+    agent = make_agent(
+        preferences={"include_keywords": ["rust", "story"]},
+        ranking={**NO_DECAY, "keyword_weight": 5.0, "source_weights": {"Muted": 0.0}}
+    )
+    
+    items = batch("Hacker News", [300, 200, 100], "hn") + batch("Muted", [1], "muted")
+    items[2].title = "Rust story"
+    agent.score_normalizer.update(items)
+    ranked = agent._filter_and_rank_items(items)
+    assert ranked[0] is items[2]
+    assert all(item.source != "Muted" for item in ranked)